@@ -1,8 +1,18 @@
 from __future__ import annotations
 
-from importlib.metadata import PackageNotFoundError, version
+from typing import Any
 
-try:
-    __version__ = version("dpi-ai-governance-lab")
-except PackageNotFoundError:  # editable / source tree
-    __version__ = "0.4.1"
+
+def __getattr__(name: str) -> Any:
+    # __version__ is resolved on first use: importlib.metadata is slow to
+    # import and most CLI invocations (lint, --help) never need it.
+    if name == "__version__":
+        from importlib.metadata import PackageNotFoundError, version
+
+        try:
+            value = version("dpi-ai-governance-lab")
+        except PackageNotFoundError:  # editable / source tree
+            value = "0.4.1"
+        globals()["__version__"] = value
+        return value
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
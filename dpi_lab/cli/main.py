@@ -5,8 +5,13 @@ Goal: make the repo usable as a local workbench:
 - extract: PDF -> canonicalized text + hashes
 - scaffold: create a review directory with the contract files
 - review: extract + generate a deterministic baseline review (local engine)
+- review-batch: run review over a manifest of papers with a worker pool (resumable)
+- rerender: rebuild review artifacts from persisted run/ responses (no model calls)
 - validate: enforce the review contract and schemas
 - lint: basic markdown hygiene checks
+- index: SQLite index of scorecards/metadata/manifests for corpus queries
+- stats: vectorized score analytics over the index (optional numpy)
+- search: BM25 full-text search over extracted pages
 
 This includes:
 - a *local* deterministic engine to keep the workflow runnable without external services
@@ -17,82 +22,164 @@ This includes:
 from __future__ import annotations
 
 import argparse
-
-from dpi_lab import __version__
 import sys
 from pathlib import Path
 
-from dpi_lab.core.extract import extract_pdf
-from dpi_lab.core.review import run_review
-from dpi_lab.core.scaffold import scaffold_review
-from dpi_lab.core.validate import validate_tree, validate_review_dir
-from dpi_lab.core.lint import lint_markdown_paths
+# Subcommand modules (pypdf, jsonschema, yaml, engines) are imported inside
+# their branch of main() so `dpi-lab --help` and `dpi-lab lint` start fast.
+# tools/benchmarks/cli_startup.py guards this.
+from dpi_lab.core.utils import default_cache_dir
 
 
-def _p(s: str) -> Path:
-    return Path(s).expanduser().resolve()
+class _VersionAction(argparse.Action):
+    """--version that resolves the package version only when requested."""
 
+    def __init__(self, option_strings: list[str], dest: str = argparse.SUPPRESS, **kwargs: object) -> None:
+        super().__init__(option_strings, dest=dest, default=argparse.SUPPRESS, nargs=0, help="show program's version number and exit")
 
-def build_parser() -> argparse.ArgumentParser:
-    p = argparse.ArgumentParser(prog="dpi-lab", description="DPI AI Governance Lab workbench")
-    p.add_argument("--version", action="version", version=f"%(prog)s {__version__}")
-    sub = p.add_subparsers(dest="cmd", required=True)
+    def __call__(self, parser, namespace, values, option_string=None) -> None:  # type: ignore[override]
+        from dpi_lab import __version__
 
-    p_extract = sub.add_parser("extract", help="Extract and canonicalize text from a PDF")
-    p_extract.add_argument("--pdf", required=True, help="Path to PDF")
-    p_extract.add_argument("--out", required=True, help="Output directory")
+        parser.exit(message=f"{parser.prog} {__version__}\n")
 
-    p_scaffold = sub.add_parser("scaffold", help="Create a new review directory scaffold")
-    p_scaffold.add_argument("--slug", required=True, help="Review slug")
-    p_scaffold.add_argument("--out", required=True, help="Base output directory (batch folder)")
-    p_scaffold.add_argument("--pdf", help="Optional PDF to copy into review dir")
 
-    p_review = sub.add_parser("review", help="Run end-to-end review pipeline")
-    p_review.add_argument("--pdf", required=True, help="Path to PDF")
-    p_review.add_argument("--slug", required=True, help="Review slug")
-    p_review.add_argument("--out", required=True, help="Base output directory (batch folder)")
-    p_review.add_argument(
+def _p(s: str) -> Path:
+    return Path(s).expanduser().resolve()
+
+
+def _add_review_options(p: argparse.ArgumentParser) -> None:
+    """Engine, chunking and cache options shared by review and review-batch."""
+    p.add_argument(
         "--engine",
         default="local",
-        choices=["local", "openai"],
-        help="Generation engine. 'local' is scaffold-only; 'openai' uses the OpenAI API (requires OPENAI_API_KEY).",
+        choices=["local", "local-extractive", "openai"],
+        help=(
+            "Generation engine. 'local' is scaffold-only; 'local-extractive' scores and quotes the paper offline; "
+            "'openai' uses the OpenAI API (requires OPENAI_API_KEY)."
+        ),
     )
-    p_review.add_argument(
+    p.add_argument(
         "--model",
         default=None,
         help="Model name for model-backed engines (e.g., gpt-5). Ignored by local engine.",
     )
-    p_review.add_argument(
+    p.add_argument(
         "--max-input-chars",
         type=int,
         default=180_000,
         help="Maximum characters to send in a single-pass call. If exceeded, chunking is used (engine-dependent).",
     )
-    p_review.add_argument(
+    p.add_argument(
         "--max-input-tokens",
         type=int,
         default=None,
         help="Preferred maximum tokens for a single-pass call (OpenAI engine uses tokenizer when available). Overrides --max-input-chars when set.",
     )
-    p_review.add_argument(
+    p.add_argument(
         "--chunk-max-chars",
         type=int,
         default=60_000,
         help="Target maximum characters per chunk when chunking is enabled.",
     )
-    p_review.add_argument(
+    p.add_argument(
         "--chunk-max-tokens",
         type=int,
         default=None,
         help="Preferred maximum tokens per chunk when chunking is enabled (OpenAI engine uses tokenizer when available).",
     )
-    p_review.add_argument(
+    p.add_argument(
         "--chunk-max-count",
         type=int,
         default=12,
-        help="Maximum number of chunks to process (prevents runaway costs).",
+        help="Maximum number of chunk digests per reduce prompt; more are merged hierarchically (see --reduce-fan-in).",
+    )
+    p.add_argument(
+        "--reduce-fan-in",
+        type=int,
+        default=4,
+        help="Digests merged per intermediate reduce call when a paper exceeds --chunk-max-count chunks.",
+    )
+    p.add_argument(
+        "--chunk-strategy",
+        default="greedy",
+        choices=["greedy", "balanced"],
+        help="Chunk planning: 'greedy' fills chunks to the budget (tree-reducing past --chunk-max-count); "
+        "'balanced' spreads all pages evenly over at most --chunk-max-count chunks.",
+    )
+    p.add_argument(
+        "--map-concurrency",
+        type=int,
+        default=4,
+        help="Maximum concurrent model calls for the chunk map pass and the reduce-phase artifact calls (model-backed engines). Outputs keep a deterministic order.",
+    )
+    p.add_argument(
+        "--extract-workers",
+        type=int,
+        default=1,
+        help="Extract PDF page ranges in N parallel processes (output is identical to the serial path).",
+    )
+    p.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Workbench cache root (default: $DPI_LAB_CACHE_DIR or ~/.cache/dpi-lab). Extractions and model responses are cached under <cache-dir>/extract and <cache-dir>/responses.",
+    )
+    p.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the extraction and response caches; always re-parse the PDF and call the provider.",
+    )
+
+
+def build_parser() -> argparse.ArgumentParser:
+    p = argparse.ArgumentParser(prog="dpi-lab", description="DPI AI Governance Lab workbench")
+    p.add_argument("--version", action=_VersionAction)
+    sub = p.add_subparsers(dest="cmd", required=True)
+
+    p_extract = sub.add_parser("extract", help="Extract and canonicalize text from a PDF")
+    p_extract.add_argument("--pdf", required=True, help="Path to PDF")
+    p_extract.add_argument("--out", required=True, help="Output directory")
+    p_extract.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Extract page ranges in N parallel processes (output is identical to the serial path).",
+    )
+    p_extract.add_argument(
+        "--cache-dir",
+        default=None,
+        help="Workbench cache root (default: $DPI_LAB_CACHE_DIR or ~/.cache/dpi-lab). Extractions are cached under <cache-dir>/extract.",
+    )
+    p_extract.add_argument("--no-cache", action="store_true", help="Always re-parse the PDF; do not read or write the extraction cache.")
+
+    p_scaffold = sub.add_parser("scaffold", help="Create a new review directory scaffold")
+    p_scaffold.add_argument("--slug", required=True, help="Review slug")
+    p_scaffold.add_argument("--out", required=True, help="Base output directory (batch folder)")
+    p_scaffold.add_argument("--pdf", help="Optional PDF to copy into review dir")
+
+    p_review = sub.add_parser("review", help="Run end-to-end review pipeline")
+    p_review.add_argument("--pdf", required=True, help="Path to PDF")
+    p_review.add_argument("--slug", required=True, help="Review slug")
+    p_review.add_argument("--out", required=True, help="Base output directory (batch folder)")
+    _add_review_options(p_review)
+    p_review.add_argument(
+        "--incremental",
+        default=None,
+        metavar="PREVIOUS_REVIEW_DIR",
+        help="Reuse chunk digests from a previous review (e.g. of an earlier edition) for unchanged chunks.",
     )
 
+    p_batch = sub.add_parser("review-batch", help="Review every paper in a manifest with a worker pool (resumable)")
+    p_batch.add_argument("--manifest", required=True, help="CSV (pdf,slug[,engine,model]) or YAML list of papers")
+    p_batch.add_argument("--out", required=True, help="Batch directory; each paper is reviewed into <out>/<slug>")
+    p_batch.add_argument("--workers", type=int, default=1, help="Number of papers reviewed in parallel processes.")
+    _add_review_options(p_batch)
+
+    p_rerender = sub.add_parser(
+        "rerender",
+        help="Rebuild review artifacts from persisted run/ responses (no network, no tokenizer)",
+    )
+    p_rerender.add_argument("path", help="Path to a review directory or a tree containing review directories")
+
     p_validate = sub.add_parser("validate", help="Validate a review directory")
     p_validate.add_argument("path", help="Path to a review directory or a tree containing review directories")
     p_validate.add_argument(
@@ -104,8 +191,11 @@ def build_parser() -> argparse.ArgumentParser:
     p_validate.add_argument(
         "--engine",
         default=None,
-        choices=["local", "openai"],
-        help="Engine to use for semantic validation (ignored unless --level semantic). Defaults to manifest engine.",
+        choices=["local", "local-extractive", "openai"],
+        help=(
+            "Engine to use for semantic validation (ignored unless --level semantic). Defaults to manifest engine. "
+            "Local engines check offline that quotes and scorecard evidence cues appear in the extracted pages."
+        ),
     )
     p_validate.add_argument(
         "--model",
@@ -124,25 +214,158 @@ def build_parser() -> argparse.ArgumentParser:
         default=None,
         help="Preferred maximum tokens passed to semantic validator (best-effort bound; engine dependent).",
     )
+    p_validate.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Review directories validated in parallel (processes; threads for --level semantic). Output order is stable.",
+    )
+    p_validate.add_argument(
+        "--changed-only",
+        action="store_true",
+        help="Print which review directories were re-checked (unchanged ones reuse cached results).",
+    )
+    p_validate.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and do not update the validation result cache (.dpi-lab-cache/validation.json).",
+    )
+    p_validate.add_argument(
+        "--force",
+        action="store_true",
+        help="Re-run semantic validation even if run/semantic-validation.json was stamped with the same inputs.",
+    )
 
     p_lint = sub.add_parser("lint", help="Lint markdown files for basic hygiene")
     p_lint.add_argument("paths", nargs="+", help="Files or directories")
+    p_lint.add_argument(
+        "--jobs",
+        type=int,
+        default=1,
+        help="Files linted in parallel (processes). Output is in sorted path order.",
+    )
+    p_lint.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Ignore and do not update the lint result cache (.dpi-lab-cache/lint.json).",
+    )
+
+    p_index = sub.add_parser("index", help="SQLite index of review scorecards, metadata and manifests")
+    index_sub = p_index.add_subparsers(dest="index_cmd", required=True)
+    p_index_build = index_sub.add_parser("build", help="Add or refresh review directories under a root (incremental)")
+    p_index_build.add_argument("root", help="Review directory or tree of review directories")
+    p_index_query = index_sub.add_parser("query", help="Filtered or grouped lookups over the index")
+    p_index_query.add_argument(
+        "--where",
+        action="append",
+        default=[],
+        metavar="EXPR",
+        help="Numeric filter such as 'redress<2' or 'year>=2025' (score dimensions, year, published_year); repeatable.",
+    )
+    p_index_query.add_argument("--tag", default=None, help="Only reviews with this metadata tag")
+    p_index_query.add_argument("--batch", default=None, help="Only reviews in this batch (parent directory name)")
+    p_index_query.add_argument("--engine", default=None, help="Only reviews produced by this engine")
+    p_index_query.add_argument(
+        "--group-by",
+        default=None,
+        choices=["batch", "year", "published_year", "engine", "model", "source", "tag"],
+        help="Aggregate: papers per group and mean score per dimension.",
+    )
+    p_index_query.add_argument("--limit", type=int, default=None)
+    p_index_query.add_argument("--sql", default=None, help="Run a read-only SQL statement instead (tables: reviews, tags).")
+    p_index_query.add_argument("--format", default="table", choices=["table", "json", "csv"])
+    p_stats = sub.add_parser("stats", help="Score distributions, correlations and per-group means from the index")
+    p_stats.add_argument("--root", default=None, help="Refresh the index from this review tree first (incremental)")
+    p_stats.add_argument(
+        "--by",
+        default="batch",
+        choices=["batch", "year", "published_year", "engine", "model", "source"],
+        help="Grouping for the per-group comparison (default: batch).",
+    )
+    p_stats.add_argument("--format", default="json", choices=["json", "csv"])
+    p_search = sub.add_parser("search", help="BM25 full-text search over extracted pages")
+    search_sub = p_search.add_subparsers(dest="search_cmd", required=True)
+    p_search_build = search_sub.add_parser("build", help="Index extracted pages under a root (incremental by pages_sha256)")
+    p_search_build.add_argument("root", help="Review directory or tree of review directories")
+    p_search_query = search_sub.add_parser("query", help="Top (review, page, snippet) hits for a query")
+    p_search_query.add_argument("query", help="Words to look for (stemmed, case-insensitive)")
+    p_search_query.add_argument("--limit", type=int, default=10)
+    p_search_query.add_argument("--any", action="store_true", help="Match pages with any query word (default: all words).")
+    p_search_query.add_argument("--review", default=None, help="Only review directories whose path contains this text")
+    p_search_query.add_argument("--format", default="table", choices=["table", "json", "csv"])
+    for sp in (p_search_build, p_search_query):
+        sp.add_argument(
+            "--db",
+            default=str(Path(".dpi-lab-cache") / "search.sqlite"),
+            help="Search index database (default: .dpi-lab-cache/search.sqlite).",
+        )
+
+    for sp in (p_index_build, p_index_query, p_stats):
+        sp.add_argument(
+            "--db",
+            default=str(Path(".dpi-lab-cache") / "corpus.sqlite"),
+            help="Index database (default: .dpi-lab-cache/corpus.sqlite).",
+        )
 
     return p
 
 
+def _print_table(columns: list[str], rows: list, fmt: str) -> None:
+    if fmt == "json":
+        import json
+
+        print(json.dumps([dict(zip(columns, r)) for r in rows], indent=2, ensure_ascii=False))
+        return
+    if fmt == "csv":
+        import csv
+
+        w = csv.writer(sys.stdout, lineterminator="\n")
+        w.writerow(columns)
+        w.writerows(rows)
+        return
+    cells = [[("" if v is None else str(v)) for v in r] for r in rows]
+    widths = [max([len(c)] + [len(r[i]) for r in cells]) for i, c in enumerate(columns)]
+    for r in [list(columns)] + cells:
+        print("  ".join(v.ljust(w) for v, w in zip(r, widths)).rstrip())
+
+
+def _review_kwargs(args: argparse.Namespace) -> dict:
+    return {
+        "max_input_chars": args.max_input_chars,
+        "chunk_max_chars": args.chunk_max_chars,
+        "chunk_max_count": args.chunk_max_count,
+        "chunk_strategy": args.chunk_strategy,
+        "reduce_fan_in": args.reduce_fan_in,
+        "max_input_tokens": args.max_input_tokens,
+        "chunk_max_tokens": args.chunk_max_tokens,
+        "map_concurrency": args.map_concurrency,
+        "extract_workers": args.extract_workers,
+        "cache_dir": None if args.no_cache else (_p(args.cache_dir) if args.cache_dir else default_cache_dir()),
+    }
+
+
 def main(argv: list[str] | None = None) -> int:
     argv = argv or sys.argv[1:]
     args = build_parser().parse_args(argv)
 
     if args.cmd == "extract":
+        from dpi_lab.core.extract import extract_pdf
+
         out = _p(args.out)
         out.mkdir(parents=True, exist_ok=True)
-        res = extract_pdf(pdf_path=_p(args.pdf), out_dir=out)
+        cache_root = None if args.no_cache else (_p(args.cache_dir) if args.cache_dir else default_cache_dir())
+        res = extract_pdf(
+            pdf_path=_p(args.pdf),
+            out_dir=out,
+            workers=args.workers,
+            cache_dir=cache_root / "extract" if cache_root is not None else None,
+        )
         print(res["message"])
         return 0
 
     if args.cmd == "scaffold":
+        from dpi_lab.core.scaffold import scaffold_review
+
         base = _p(args.out)
         base.mkdir(parents=True, exist_ok=True)
         review_dir = scaffold_review(base_dir=base, slug=args.slug, pdf_path=_p(args.pdf) if args.pdf else None)
@@ -150,6 +373,8 @@ def main(argv: list[str] | None = None) -> int:
         return 0
 
     if args.cmd == "review":
+        from dpi_lab.core.review import run_review
+
         base = _p(args.out)
         base.mkdir(parents=True, exist_ok=True)
         review_dir = run_review(
@@ -158,16 +383,49 @@ def main(argv: list[str] | None = None) -> int:
             slug=args.slug,
             engine=args.engine,
             model=args.model,
-            max_input_chars=args.max_input_chars,
-            chunk_max_chars=args.chunk_max_chars,
-            chunk_max_count=args.chunk_max_count,
-            max_input_tokens=args.max_input_tokens,
-            chunk_max_tokens=args.chunk_max_tokens,
+            incremental_from=_p(args.incremental) if args.incremental else None,
+            **_review_kwargs(args),
         )
         print(str(review_dir))
         return 0
 
+    if args.cmd == "review-batch":
+        from dpi_lab.core.batch import run_batch
+
+        res = run_batch(
+            _p(args.manifest),
+            _p(args.out),
+            workers=args.workers,
+            engine=args.engine,
+            model=args.model,
+            **_review_kwargs(args),
+        )
+        for e in res.entries:
+            err = f"  {e['error']}" if e.get("error") else ""
+            print(f"{e['status']:<8} {e['seconds']:>9.2f}s  {e['slug']}{err}")
+        print(f"Summary: {res.summary_path}")
+        return 0 if res.ok else 1
+
+    if args.cmd == "rerender":
+        from dpi_lab.core.review import rerender_tree
+
+        rr = rerender_tree(_p(args.path))
+        for d in rr.rendered:
+            print(str(d))
+        if rr.skipped:
+            print("Skipped:")
+            for sk in rr.skipped:
+                print(f"- {sk}")
+        if rr.errors:
+            print("FAILED")
+            for e in rr.errors:
+                print(f"- {e}")
+            return 1
+        return 0
+
     if args.cmd == "validate":
+        from dpi_lab.core.validate import validate_tree
+
         result = validate_tree(
             _p(args.path),
             level=args.level,
@@ -175,7 +433,15 @@ def main(argv: list[str] | None = None) -> int:
             model=args.model,
             max_input_chars=args.max_input_chars,
             max_input_tokens=args.max_input_tokens,
+            jobs=args.jobs,
+            cache_path=None if args.no_cache else Path(".dpi-lab-cache") / "validation.json",
+            semantic_force=args.force,
         )
+        if args.changed_only:
+            total = len(result.checked) + len(result.cached)
+            print(f"Re-checked {len(result.checked)} of {total} review directories:")
+            for d in result.checked:
+                print(f"- {d}")
         if result.ok:
             print("OK")
             if result.warnings:
@@ -194,8 +460,14 @@ def main(argv: list[str] | None = None) -> int:
         return 1
 
     if args.cmd == "lint":
+        from dpi_lab.core.lint import lint_markdown_paths
+
         paths = [_p(x) for x in args.paths]
-        res = lint_markdown_paths(paths)
+        res = lint_markdown_paths(
+            paths,
+            jobs=args.jobs,
+            cache_path=None if args.no_cache else Path(".dpi-lab-cache") / "lint.json",
+        )
         if res.ok:
             print("OK")
             if res.warnings:
@@ -208,4 +480,96 @@ def main(argv: list[str] | None = None) -> int:
             print(f"- {e}")
         return 1
 
+    if args.cmd == "index":
+        from dpi_lab.core.index import build_index, query_index
+
+        if args.index_cmd == "build":
+            br = build_index(_p(args.root), _p(args.db))
+            print(
+                f"Indexed {_p(args.db)}: {len(br.added)} added, {len(br.updated)} updated, "
+                f"{len(br.unchanged)} unchanged, {len(br.removed)} removed"
+            )
+            for w in br.warnings:
+                print(f"- {w}")
+            if not br.ok:
+                print("FAILED")
+                for e in br.errors:
+                    print(f"- {e}")
+                return 1
+            return 0
+
+        try:
+            qr = query_index(
+                _p(args.db),
+                where=args.where,
+                tag=args.tag,
+                batch=args.batch,
+                engine=args.engine,
+                group_by=args.group_by,
+                limit=args.limit,
+                sql=args.sql,
+            )
+        except (OSError, ValueError) as ex:
+            print("FAILED")
+            print(f"- {ex}")
+            return 1
+        _print_table(qr.columns, qr.rows, args.format)
+        return 0
+
+    if args.cmd == "search":
+        from dpi_lab.core.search import build_search_index, search
+
+        if args.search_cmd == "build":
+            sr = build_search_index(_p(args.root), _p(args.db))
+            print(
+                f"Indexed {_p(args.db)}: {len(sr.added)} added, {len(sr.updated)} updated, "
+                f"{len(sr.unchanged)} unchanged, {len(sr.removed)} removed"
+            )
+            for w in sr.warnings:
+                print(f"- {w}")
+            if not sr.ok:
+                print("FAILED")
+                for e in sr.errors:
+                    print(f"- {e}")
+                return 1
+            return 0
+
+        try:
+            hits = search(_p(args.db), args.query, limit=args.limit, any_term=args.any, review=args.review)
+        except (OSError, ValueError) as ex:
+            print("FAILED")
+            print(f"- {ex}")
+            return 1
+        _print_table(
+            ["review_dir", "page", "score", "snippet"],
+            [(h.review_dir, h.page, h.score, h.snippet) for h in hits],
+            args.format,
+        )
+        return 0
+
+    if args.cmd == "stats":
+        from dpi_lab.core.index import build_index
+        from dpi_lab.core.stats import corpus_stats, stats_rows
+
+        if args.root:
+            br = build_index(_p(args.root), _p(args.db))
+            if not br.ok:
+                print("FAILED")
+                for e in br.errors:
+                    print(f"- {e}")
+                return 1
+        try:
+            st = corpus_stats(_p(args.db), by=args.by)
+        except (OSError, ValueError, RuntimeError) as ex:
+            print("FAILED")
+            print(f"- {ex}")
+            return 1
+        if args.format == "csv":
+            _print_table(["section", "group", "dimension", "metric", "value"], stats_rows(st), "csv")
+        else:
+            import json
+
+            print(json.dumps(st, indent=2, ensure_ascii=False))
+        return 0
+
     return 2
@@ -0,0 +1,204 @@
+from __future__ import annotations
+
+"""Batch review runner.
+
+Runs run_review over a manifest of papers with a process pool.
+
+Resumability:
+- A paper is skipped when its review dir already has a run/manifest.json whose
+  pdf_sha256, engine and model match, and all contract artifacts exist.
+- Each finished paper is appended to <batch_dir>/batch-journal.jsonl as soon
+  as it completes (a progress log); an interrupted batch picks up where it
+  stopped because finished papers already have their manifest.
+"""
+
+import csv
+import json
+import re
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List
+
+import yaml
+
+from dpi_lab.core.review import run_review
+from dpi_lab.core.utils import safe_write_text, sha256_file
+
+
+CONTRACT_FILES = (
+    "paper-analysis.md",
+    "paper-review-report.md",
+    "paper-review-metadata.yaml",
+    "paper-review-scorecard.yaml",
+)
+
+JOURNAL_NAME = "batch-journal.jsonl"
+SUMMARY_NAME = "batch-summary.json"
+
+
+@dataclass
+class BatchResult:
+    ok: bool
+    entries: List[Dict[str, Any]]
+    summary_path: Path
+
+
+def _slugify(s: str) -> str:
+    return re.sub(r"[^a-z0-9]+", "-", s.lower()).strip("-") or "paper"
+
+
+def load_batch_manifest(path: Path) -> List[Dict[str, Any]]:
+    """Load papers from a CSV (header row) or YAML (list, or {papers: [...]}) manifest.
+
+    Each paper needs a `pdf`; `slug` defaults to the PDF stem. Optional
+    `engine` and `model` override the batch defaults. Relative PDF paths are
+    resolved against the manifest's directory.
+    """
+    path = path.resolve()
+    if path.suffix.lower() == ".csv":
+        with path.open(encoding="utf-8", newline="") as f:
+            rows = [dict(r) for r in csv.DictReader(f)]
+    else:
+        obj = yaml.safe_load(path.read_text(encoding="utf-8"))
+        rows = obj.get("papers", []) if isinstance(obj, dict) else obj
+    if not isinstance(rows, list):
+        raise ValueError(f"{path}: expected a list of papers")
+
+    papers: List[Dict[str, Any]] = []
+    seen: set[str] = set()
+    for i, row in enumerate(rows, start=1):
+        if not isinstance(row, dict) or not row.get("pdf"):
+            raise ValueError(f"{path}: entry {i} has no 'pdf'")
+        pdf = Path(str(row["pdf"])).expanduser()
+        if not pdf.is_absolute():
+            pdf = path.parent / pdf
+        slug = str(row.get("slug") or _slugify(pdf.stem))
+        if slug in seen:
+            raise ValueError(f"{path}: duplicate slug '{slug}'")
+        seen.add(slug)
+        papers.append(
+            {
+                "pdf": pdf.resolve(),
+                "slug": slug,
+                "engine": row.get("engine") or None,
+                "model": row.get("model") or None,
+            }
+        )
+    return papers
+
+
+def _is_up_to_date(review_dir: Path, pdf_sha256: str, engine: str, model: str) -> bool:
+    man = review_dir / "run" / "manifest.json"
+    if not man.exists() or not all((review_dir / f).exists() for f in CONTRACT_FILES):
+        return False
+    try:
+        obj = json.loads(man.read_text(encoding="utf-8"))
+    except ValueError:
+        return False
+    return (
+        obj.get("inputs", {}).get("pdf_sha256") == pdf_sha256
+        and obj.get("engine") == engine
+        and obj.get("model") == model
+    )
+
+
+def _review_one(job: Dict[str, Any]) -> Dict[str, Any]:
+    # Runs in a worker process; never raises so one bad paper can't sink the pool.
+    t0 = time.perf_counter()
+    try:
+        run_review(**job["kwargs"])
+        status, error = "done", None
+    except Exception as ex:
+        status, error = "failed", f"{type(ex).__name__}: {ex}"
+    return {
+        "slug": job["slug"],
+        "pdf_sha256": job["pdf_sha256"],
+        "engine": job["engine"],
+        "model": job["model"],
+        "status": status,
+        "seconds": round(time.perf_counter() - t0, 3),
+        "error": error,
+    }
+
+
+def run_batch(
+    manifest_path: Path,
+    batch_dir: Path,
+    *,
+    workers: int = 1,
+    engine: str = "local",
+    model: str | None = None,
+    **review_kwargs: Any,
+) -> BatchResult:
+    """Review every paper in manifest_path into batch_dir/<slug>.
+
+    review_kwargs are passed through to run_review (chunking, cache_dir, ...).
+    """
+    batch_dir = batch_dir.resolve()
+    batch_dir.mkdir(parents=True, exist_ok=True)
+    papers = load_batch_manifest(manifest_path)
+
+    entries: Dict[str, Dict[str, Any]] = {}
+    jobs: List[Dict[str, Any]] = []
+    for paper in papers:
+        slug = paper["slug"]
+        eng = paper["engine"] or engine
+        mdl = paper["model"] or model or "gpt-5"
+        try:
+            pdf_sha = sha256_file(paper["pdf"])
+        except OSError as ex:
+            entries[slug] = {"slug": slug, "status": "failed", "seconds": 0.0, "error": f"{type(ex).__name__}: {ex}"}
+            continue
+        # A "done" journal record alone is not enough: the review may have been
+        # deleted since. Finished papers already have a matching manifest.
+        if _is_up_to_date(batch_dir / slug, pdf_sha, eng, mdl):
+            entries[slug] = {"slug": slug, "status": "skipped", "seconds": 0.0, "error": None}
+            continue
+        jobs.append(
+            {
+                "slug": slug,
+                "pdf_sha256": pdf_sha,
+                "engine": eng,
+                "model": mdl,
+                "kwargs": {
+                    "pdf_path": paper["pdf"],
+                    "base_dir": batch_dir,
+                    "slug": slug,
+                    "engine": eng,
+                    "model": mdl,
+                    **review_kwargs,
+                },
+            }
+        )
+
+    with (batch_dir / JOURNAL_NAME).open("a", encoding="utf-8") as jf:
+
+        def record(rec: Dict[str, Any]) -> None:
+            entries[rec["slug"]] = rec
+            jf.write(json.dumps(rec, ensure_ascii=False) + "\n")
+            jf.flush()
+
+        if workers <= 1 or len(jobs) <= 1:
+            for job in jobs:
+                record(_review_one(job))
+        else:
+            with ProcessPoolExecutor(max_workers=min(workers, len(jobs))) as pool:
+                futures = [pool.submit(_review_one, job) for job in jobs]
+                for fut in as_completed(futures):
+                    record(fut.result())
+
+    ordered = [entries[p["slug"]] for p in papers]
+    counts = {s: sum(1 for e in ordered if e["status"] == s) for s in ("done", "skipped", "failed")}
+    summary = {
+        "version": 1,
+        "manifest": str(Path(manifest_path).resolve()),
+        "papers": len(ordered),
+        "counts": counts,
+        "total_seconds": round(sum(e["seconds"] for e in ordered), 3),
+        "entries": [{k: e.get(k) for k in ("slug", "status", "seconds", "error")} for e in ordered],
+    }
+    summary_path = batch_dir / SUMMARY_NAME
+    safe_write_text(summary_path, json.dumps(summary, indent=2, ensure_ascii=False) + "\n")
+    return BatchResult(ok=counts["failed"] == 0, entries=ordered, summary_path=summary_path)
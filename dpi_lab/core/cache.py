@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+"""Content-addressed on-disk cache for model responses.
+
+Entries are JSON files named by the sha256 of the request key. The cache is
+size-bounded: when the total size exceeds max_bytes, the least recently used
+entries (by mtime, refreshed on every hit) are evicted first.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from dpi_lab.core.utils import safe_write_text, sha256_bytes
+
+
+def cache_key(parts: Dict[str, Any]) -> str:
+    """Stable key for a dict of JSON-serializable request parts."""
+    return sha256_bytes(json.dumps(parts, sort_keys=True, ensure_ascii=False).encode("utf-8"))
+
+
+class ResponseCache:
+    def __init__(self, root: Path, max_bytes: int) -> None:
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be > 0")
+        self.root = root
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._size: Optional[int] = None
+
+    def _path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        p = self._path(key)
+        try:
+            obj = json.loads(p.read_text(encoding="utf-8"))
+            os.utime(p)  # refresh LRU position
+        except (OSError, ValueError):
+            with self._lock:
+                self.misses += 1
+            return None
+        with self._lock:
+            self.hits += 1
+        return obj
+
+    def put(self, key: str, value: Dict[str, Any]) -> None:
+        p = self._path(key)
+        blob = json.dumps(value, ensure_ascii=False) + "\n"
+        safe_write_text(p, blob)
+        with self._lock:
+            if self._size is None:
+                self._size = self._scan_size()
+            else:
+                self._size += len(blob.encode("utf-8"))
+            if self._size > self.max_bytes:
+                self._evict()
+
+    def _entries(self) -> list[tuple[float, int, Path]]:
+        out = []
+        for p in self.root.glob("*/*.json"):
+            try:
+                st = p.stat()
+            except OSError:
+                continue
+            out.append((st.st_mtime, st.st_size, p))
+        return out
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._entries())
+
+    def _evict(self) -> None:
+        entries = sorted(self._entries(), key=lambda e: e[0])
+        total = sum(size for _, size, _ in entries)
+        for _, size, p in entries:
+            if total <= self.max_bytes:
+                break
+            try:
+                p.unlink()
+            except OSError:
+                continue
+            total -= size
+        self._size = total
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {"dir": str(self.root), "hits": self.hits, "misses": self.misses}
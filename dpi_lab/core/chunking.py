@@ -8,11 +8,17 @@ Design goals:
 - Deterministic: same extracted pages => same chunks.
 - Stable boundaries: chunks are contiguous page ranges.
 - Budget-aware: aim to keep each chunk under a character budget.
+
+Planning is separate from materialization: ChunkPlanner precomputes char and
+token prefix sums over page blocks and returns page-range plans; chunk text is
+only built for the plans that are actually sent.
 """
 
 import hashlib
+from bisect import bisect_right
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, List, Optional
+from itertools import accumulate
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Optional, Tuple
 
 
 @dataclass(frozen=True)
@@ -28,6 +34,185 @@ def _sha256_text(s: str) -> str:
     return hashlib.sha256(s.encode("utf-8")).hexdigest()
 
 
+def _page_block(page: Dict[str, Any]) -> str:
+    # Stable per-page separator improves readability and reduces accidental merges.
+    return f"--- PAGE {int(page.get('page'))} ---\n{str(page.get('text', '')).strip()}\n"
+
+
+@dataclass(frozen=True)
+class ChunkPlan:
+    """A contiguous page range; first/last index into the planner's pages (last exclusive)."""
+
+    first: int
+    last: int
+    start_page: int
+    end_page: int
+    chars: int
+    tokens: Optional[int] = None
+
+
+class ChunkPlanner:
+    """Plans contiguous page-range chunks from prefix sums over page blocks.
+
+    Sizes are measured per page block (len() and, with a token_counter, tokens);
+    each page is formatted and counted once, whatever the number of plans.
+    """
+
+    def __init__(self, pages: List[Dict[str, Any]], *, token_counter: Optional[Callable[[str], int]] = None) -> None:
+        self.pages = pages
+        self._blocks = [_page_block(p) for p in pages]
+        self._chars = [0, *accumulate(len(b) for b in self._blocks)]
+        self._tokens: Optional[List[int]] = None
+        if token_counter is not None:
+            self._tokens = [0, *accumulate(token_counter(b) for b in self._blocks)]
+
+    def __len__(self) -> int:
+        return len(self._blocks)
+
+    @property
+    def total_chars(self) -> int:
+        return self._chars[-1]
+
+    @property
+    def total_tokens(self) -> Optional[int]:
+        return self._tokens[-1] if self._tokens is not None else None
+
+    def _plan(self, first: int, last: int) -> ChunkPlan:
+        return ChunkPlan(
+            first=first,
+            last=last,
+            start_page=int(self.pages[first].get("page")),
+            end_page=int(self.pages[last - 1].get("page")),
+            chars=self._chars[last] - self._chars[first],
+            tokens=self._tokens[last] - self._tokens[first] if self._tokens is not None else None,
+        )
+
+    def plan(self, *, max_chars: int, max_tokens: Optional[int] = None) -> List[ChunkPlan]:
+        """Greedy plan: extend each chunk while it stays within both budgets.
+
+        A single page larger than the budget becomes its own chunk. The result
+        covers every page; callers decide what to do when there are too many.
+        """
+
+        self._check_budget(max_chars, max_tokens)
+        return self._plan_range(0, len(self._blocks), max_chars=max_chars, max_tokens=max_tokens)
+
+    def _check_budget(self, max_chars: int, max_tokens: Optional[int]) -> None:
+        if max_chars <= 0:
+            raise ValueError("max_chars must be > 0")
+        if max_tokens is not None:
+            if max_tokens <= 0:
+                raise ValueError("max_tokens must be > 0")
+            if self._tokens is None:
+                raise ValueError("token_counter must be provided when max_tokens is set")
+
+    def _plan_range(self, lo: int, hi: int, *, max_chars: int, max_tokens: Optional[int]) -> List[ChunkPlan]:
+        plans: List[ChunkPlan] = []
+        first = lo
+        while first < hi:
+            # Largest last such that the prefix-sum difference fits the budget.
+            last = bisect_right(self._chars, self._chars[first] + max_chars, lo=first + 1, hi=hi + 1) - 1
+            if max_tokens is not None and self._tokens is not None:
+                last = min(last, bisect_right(self._tokens, self._tokens[first] + max_tokens, lo=first + 1, hi=hi + 1) - 1)
+            last = max(last, first + 1)
+            plans.append(self._plan(first, last))
+            first = last
+        return plans
+
+    def plan_incremental(
+        self,
+        previous: Iterable[Tuple[int, int, str]],
+        *,
+        max_chars: int,
+        max_tokens: Optional[int] = None,
+    ) -> List[ChunkPlan]:
+        """Greedy plan anchored on a previous run's chunks.
+
+        previous holds (start_page, end_page, sha256) of earlier chunks. Any of
+        those page ranges whose materialized text is unchanged is kept as-is
+        (same chunk id and sha256); the pages in between are planned greedily.
+        """
+
+        self._check_budget(max_chars, max_tokens)
+        index = {int(p.get("page")): i for i, p in enumerate(self.pages)}
+        kept: List[ChunkPlan] = []
+        for start_page, end_page, sha in sorted(previous):
+            first, last = index.get(start_page), index.get(end_page)
+            if first is None or last is None or last < first:
+                continue
+            plan = self._plan(first, last + 1)
+            if kept and plan.first < kept[-1].last:
+                continue
+            if self.materialize(plan).sha256 == sha:
+                kept.append(plan)
+
+        plans: List[ChunkPlan] = []
+        first = 0
+        for plan in kept:
+            plans.extend(self._plan_range(first, plan.first, max_chars=max_chars, max_tokens=max_tokens))
+            plans.append(plan)
+            first = plan.last
+        plans.extend(self._plan_range(first, len(self._blocks), max_chars=max_chars, max_tokens=max_tokens))
+        return plans
+
+    def plan_balanced(self, count: int) -> List[ChunkPlan]:
+        """Split all pages into exactly min(count, pages) chunks of balanced size.
+
+        Minimizes the largest chunk (tokens when counted, otherwise chars) by
+        binary search over the prefix sums, then splits further where needed
+        so exactly that many chunks come out.
+        """
+
+        if count <= 0:
+            raise ValueError("count must be > 0")
+        n = len(self._blocks)
+        k = min(count, n)
+        if k == 0:
+            return []
+        prefix = self._tokens if self._tokens is not None else self._chars
+
+        def groups(limit: int) -> int:
+            used, first = 0, 0
+            while first < n:
+                last = bisect_right(prefix, prefix[first] + limit, lo=first + 1) - 1
+                if last <= first:
+                    return n + 1
+                used += 1
+                first = last
+            return used
+
+        lo = max(prefix[i + 1] - prefix[i] for i in range(n))
+        hi = prefix[-1]
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if groups(mid) <= k:
+                hi = mid
+            else:
+                lo = mid + 1
+
+        plans: List[ChunkPlan] = []
+        first = 0
+        for remaining in range(k, 0, -1):
+            last = bisect_right(prefix, prefix[first] + lo, lo=first + 1) - 1
+            # Leave at least one page for each of the remaining chunks.
+            last = max(first + 1, min(last, n - (remaining - 1)))
+            if remaining == 1:
+                last = n
+            plans.append(self._plan(first, last))
+            first = last
+        return plans
+
+    def materialize(self, plan: ChunkPlan) -> Chunk:
+        text = "\n\n".join(self._blocks[plan.first : plan.last]).strip() + "\n"
+        sha = _sha256_text(text)
+        cid = f"p{plan.start_page:04d}-p{plan.end_page:04d}-{sha[:8]}"
+        return Chunk(chunk_id=cid, start_page=plan.start_page, end_page=plan.end_page, text=text, sha256=sha)
+
+    def iter_chunks(self, plans: Iterable[ChunkPlan]) -> Iterator[Chunk]:
+        for plan in plans:
+            yield self.materialize(plan)
+
+
 def make_chunks(
     *,
     pages: List[Dict[str, Any]],
@@ -40,68 +225,15 @@ def make_chunks(
 
     - Pages are expected to be in the format: {"page": int, "text": str}
     - Chunk text is the concatenation of page texts with stable separators.
+    - At most max_count chunks are returned (later pages are dropped); use
+      ChunkPlanner directly to see the full plan or to balance into max_count.
     """
 
-    if max_chars <= 0:
-        raise ValueError("max_chars must be > 0")
     if max_count <= 0:
         raise ValueError("max_count must be > 0")
-    if max_tokens is not None:
-        if max_tokens <= 0:
-            raise ValueError("max_tokens must be > 0")
-        if token_counter is None:
-            raise ValueError("token_counter must be provided when max_tokens is set")
-
-    chunks: List[Chunk] = []
-    buf: List[str] = []
-    start_page = None
-
-    def flush(end_page: int) -> None:
-        nonlocal buf, start_page
-        if start_page is None or not buf:
-            return
-        text = "\n\n".join(buf).strip() + "\n"
-        sha = _sha256_text(text)
-        cid = f"p{start_page:04d}-p{end_page:04d}-{sha[:8]}"
-        chunks.append(Chunk(chunk_id=cid, start_page=start_page, end_page=end_page, text=text, sha256=sha))
-        buf = []
-        start_page = None
-
-    current_len = 0
-    current_tokens = 0
-    last_page = None
-    for p in pages:
-        pg = int(p.get("page"))
-        txt = str(p.get("text", ""))
-        # Stable per-page separator improves readability and reduces accidental merges.
-        page_block = f"--- PAGE {pg} ---\n{txt.strip()}\n"
-        if start_page is None:
-            start_page = pg
-            current_len = 0
-            current_tokens = 0
-
-        add_tokens = token_counter(page_block) if (max_tokens is not None and token_counter is not None) else 0
-
-        # If adding this page exceeds budget, flush current chunk first.
-        over_chars = buf and (current_len + len(page_block) > max_chars)
-        over_tokens = False
-        if max_tokens is not None:
-            over_tokens = buf and (current_tokens + add_tokens > max_tokens)
-
-        if over_chars or over_tokens:
-            flush(last_page if last_page is not None else pg)
-            if len(chunks) >= max_count:
-                break
-            start_page = pg
-            current_len = 0
-            current_tokens = 0
-
-        buf.append(page_block)
-        current_len += len(page_block)
-        current_tokens += add_tokens
-        last_page = pg
-
-    if len(chunks) < max_count and buf and last_page is not None:
-        flush(last_page)
+    if max_tokens is not None and token_counter is None:
+        raise ValueError("token_counter must be provided when max_tokens is set")
 
-    return chunks
+    planner = ChunkPlanner(pages, token_counter=token_counter if max_tokens is not None else None)
+    plans = planner.plan(max_chars=max_chars, max_tokens=max_tokens)
+    return list(planner.iter_chunks(plans[:max_count]))
@@ -1,25 +1,38 @@
 from __future__ import annotations
 
+from pathlib import Path
 from typing import Dict
 
 from dpi_lab.engines.base import ReviewEngine
 
 
-def get_engine(name: str) -> ReviewEngine:
+def get_engine(name: str, *, review_dir: Path | None = None) -> ReviewEngine:
     name = (name or "").strip().lower()
     if name == "local":
         from dpi_lab.core.local_engine import LocalEngineAdapter
 
         return LocalEngineAdapter()
+    if name == "local-extractive":
+        from dpi_lab.core.local_extractive import LocalExtractiveEngine
+
+        return LocalExtractiveEngine()
     if name == "openai":
         from dpi_lab.engines.openai_engine import OpenAIEngine
 
         return OpenAIEngine()
+    if name == "replay":
+        if review_dir is None:
+            raise ValueError("Engine 'replay' requires review_dir (the review to replay)")
+        from dpi_lab.engines.replay_engine import ReplayEngine
+
+        return ReplayEngine(review_dir)
     raise ValueError(f"Unsupported engine: {name}")
 
 
 def list_engines() -> Dict[str, str]:
     return {
         "local": "Deterministic scaffold-only engine (no model calls)",
+        "local-extractive": "Deterministic extractive engine: keyword/TF-IDF evidence and heuristic scores (no model calls)",
         "openai": "OpenAI model-backed engine (JSON-first + deterministic rendering)",
+        "replay": "Re-parse persisted run/responses/raw.json (no network, no tokenizer)",
     }
@@ -1,29 +1,183 @@
 from __future__ import annotations
 
+import os
 import re
 import json
+import shutil
+import uuid
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Tuple
 
 from pypdf import PdfReader
 
-from dpi_lab.core.utils import sha256_file, sha256_bytes, safe_write_text
+from dpi_lab.core.utils import StreamingTextWriter, safe_write_text, sha256_file
 
 
 PAGE_MARKER_FMT = "\n\n--- PAGE {n} ---\n\n"
 
+# Bump when canonicalization output changes; keys the extraction cache and
+# matches the v1 suffix of the extracted file names.
+CANONICALIZATION_VERSION = 1
 
-def canonicalize_text(s: str) -> str:
+EXTRACTED_FILES = (
+    "paper.pdf.sha256",
+    "paper.text.v1.txt",
+    "paper.text.v1.sha256",
+    "paper.pages.v1.json",
+    "paper.pages.v1.sha256",
+)
+
+
+def _normalize_text(s: str) -> str:
     # Normalize line endings, strip trailing spaces, collapse excessive blank lines.
     s = s.replace('\r\n', '\n').replace('\r', '\n')
     s = "\n".join([ln.rstrip() for ln in s.split('\n')])
     # Collapse 3+ newlines to 2 newlines
-    s = re.sub(r"\n{3,}", "\n\n", s)
-    return s.strip() + "\n"
+    return re.sub(r"\n{3,}", "\n\n", s)
+
+
+def canonicalize_text(s: str) -> str:
+    return _normalize_text(s).strip() + "\n"
+
+
+def iter_canonical_pages(raw_pages: Iterable[str]) -> Iterator[Tuple[int, str, str]]:
+    """Stream canonical output one page at a time.
+
+    Yields (page_number, page_text, text_piece) where page_text is the
+    canonical per-page text and the concatenation of all text_pieces plus a
+    final newline equals canonicalize_text() of the pages joined with
+    PAGE_MARKER_FMT. Markers start and end with a blank line, so any blank
+    lines at a page boundary collapse to exactly one and each page can be
+    normalized on its own. Memory is bounded by the largest page.
+    """
+    for i, raw in enumerate(raw_pages, start=1):
+        body = _normalize_text(raw)
+        core = body.strip("\n")
+        marker = PAGE_MARKER_FMT.format(n=i).strip()
+        piece = f"{marker}\n\n{core}" if core else marker
+        yield i, body.strip() + "\n", piece if i == 1 else "\n\n" + piece
+
+
+def iter_canonical_text(raw_pages: Iterable[str]) -> Iterator[str]:
+    """Streaming equivalent of canonicalize_text() over page-delimited text."""
+    for _, _, piece in iter_canonical_pages(raw_pages):
+        yield piece
+    yield "\n"
+
+
+def canonicalize_pages(raw_pages: Iterable[str]) -> Tuple[str, List[Dict[str, Any]]]:
+    """In-memory combined canonical text and per-page structure."""
+    pieces: List[str] = []
+    pages: List[Dict[str, Any]] = []
+    for i, page_text, piece in iter_canonical_pages(raw_pages):
+        pieces.append(piece)
+        pages.append({"page": i, "text": page_text})
+    return "".join(pieces) + "\n", pages
+
+
+def _page_text(page: Any) -> str:
+    try:
+        return page.extract_text() or ""
+    except Exception:
+        return ""
+
+
+def _extract_page_range(pdf_path: str, start: int, stop: int) -> List[str]:
+    """Raw text of pages [start, stop) (0-based). Runs in worker processes."""
+    reader = PdfReader(pdf_path)
+    return [_page_text(reader.pages[i]) for i in range(start, stop)]
 
 
-def extract_pdf(pdf_path: Path, out_dir: Path) -> dict:
+def iter_raw_pages(reader: PdfReader, pdf_path: Path, workers: int = 1) -> Iterator[str]:
+    """Raw per-page text in page order, optionally split across processes.
+
+    Serially, pages are pulled from reader one at a time. With workers > 1,
+    each worker opens its own PdfReader on a contiguous page range; ranges are
+    smaller than page_count / workers so slow pages do not stall one worker.
+    """
+    page_count = len(reader.pages)
+    if workers <= 1 or page_count < 2:
+        for page in reader.pages:
+            yield _page_text(page)
+        return
+
+    span = max(1, page_count // (workers * 4))
+    starts = list(range(0, page_count, span))
+    stops = [min(page_count, s + span) for s in starts]
+    with ProcessPoolExecutor(max_workers=min(workers, len(starts))) as pool:
+        for part in pool.map(_extract_page_range, [str(pdf_path)] * len(starts), starts, stops):
+            yield from part
+
+
+def _pages_json_piece(index: int, page: int, text: str) -> str:
+    # One element of json.dumps({"version": 1, "pages": [...]}, indent=2).
+    sep = "" if index == 0 else ","
+    return f'{sep}\n    {{\n      "page": {page},\n      "text": {json.dumps(text, ensure_ascii=False)}\n    }}'
+
+
+def write_canonical_outputs(raw_pages: Iterable[str], out_dir: Path) -> Tuple[int, str, str]:
+    """Stream paper.text.v1.txt and paper.pages.v1.json into out_dir.
+
+    Each page is normalized once and appended to both files, which are hashed
+    as they are written. Returns (page_count, text_sha256, pages_sha256).
+    """
+    n = 0
+    with StreamingTextWriter(out_dir / "paper.text.v1.txt") as text_w, StreamingTextWriter(
+        out_dir / "paper.pages.v1.json"
+    ) as pages_w:
+        pages_w.write('{\n  "version": 1,\n  "pages": [')
+        for n, page_text, piece in iter_canonical_pages(raw_pages):
+            text_w.write(piece)
+            pages_w.write(_pages_json_piece(n - 1, n, page_text))
+        text_w.write("\n")
+        pages_w.write("\n  ]\n}\n" if n else "]\n}\n")
+    return n, text_w.hexdigest(), pages_w.hexdigest()
+
+
+def _link_or_copy(src: Path, dst: Path) -> None:
+    if dst.exists() or dst.is_symlink():
+        dst.unlink()
+    try:
+        os.link(src, dst)
+    except OSError:
+        shutil.copyfile(src, dst)
+
+
+def _cache_entry(cache_dir: Path, pdf_hash: str) -> Path:
+    return cache_dir / f"{pdf_hash}.v{CANONICALIZATION_VERSION}"
+
+
+def _store_in_cache(entry: Path, out_dir: Path, meta: Dict[str, Any]) -> None:
+    # Populate a temp dir and rename it into place so readers never see a
+    # partial entry. If another process won the race, keep theirs.
+    if entry.exists():
+        return
+    entry.parent.mkdir(parents=True, exist_ok=True)
+    tmp = entry.with_name(f".{entry.name}.{uuid.uuid4().hex}.tmp")
+    tmp.mkdir()
+    try:
+        for name in EXTRACTED_FILES:
+            _link_or_copy(out_dir / name, tmp / name)
+        safe_write_text(tmp / "meta.json", json.dumps(meta, indent=2) + "\n")
+        os.replace(tmp, entry)
+    except OSError:
+        pass
+    finally:
+        if tmp.exists():
+            shutil.rmtree(tmp, ignore_errors=True)
+
+
+def extract_pdf(pdf_path: Path, out_dir: Path, *, workers: int = 1, cache_dir: Path | None = None) -> dict:
     """Extract text per page from PDF and write canonicalized outputs.
 
+    workers > 1 extracts page ranges in parallel processes; outputs are
+    byte-identical to the serial path.
+
+    cache_dir is a content-addressed extraction store keyed on the PDF hash
+    and CANONICALIZATION_VERSION. On a hit the stored outputs are hardlinked
+    (or copied) into out_dir and the PDF is not parsed at all.
+
     Outputs:
       - paper.pdf.sha256
       - paper.text.v1.txt (canonicalized, page-delimited)
@@ -34,45 +188,50 @@ def extract_pdf(pdf_path: Path, out_dir: Path) -> dict:
     pdf_path = pdf_path.resolve()
     out_dir = out_dir.resolve()
 
-    reader = PdfReader(str(pdf_path))
-    pages_text = []
-    for i, page in enumerate(reader.pages, start=1):
+    pdf_hash = sha256_file(pdf_path)
+
+    entry = _cache_entry(cache_dir, pdf_hash) if cache_dir is not None else None
+    if entry is not None and (entry / "meta.json").exists():
         try:
-            t = page.extract_text() or ""
-        except Exception:
-            t = ""
-        pages_text.append(PAGE_MARKER_FMT.format(n=i) + t)
-
-    combined = "".join(pages_text)
-    canon = canonicalize_text(combined)
-
-    # Build a canonical per-page structure for deterministic downstream chunking.
-    pages = []
-    for i, raw in enumerate(reader.pages, start=1):
-        # We re-extract in the loop above; reuse pages_text by stripping the marker.
-        # pages_text[i-1] begins with PAGE_MARKER_FMT and then the page text.
-        page_block = pages_text[i - 1]
-        page_txt = page_block.split(PAGE_MARKER_FMT.format(n=i), 1)[-1]
-        page_txt = canonicalize_text(page_txt)
-        pages.append({"page": i, "text": page_txt})
+            meta = json.loads((entry / "meta.json").read_text(encoding="utf-8"))
+            out_dir.mkdir(parents=True, exist_ok=True)
+            for name in EXTRACTED_FILES:
+                _link_or_copy(entry / name, out_dir / name)
+            return {
+                "pdf": str(pdf_path),
+                "out": str(out_dir),
+                "pdf_sha256": pdf_hash,
+                "text_sha256": meta["text_sha256"],
+                "pages_sha256": meta["pages_sha256"],
+                "cached": True,
+                "message": f"Reused cached extraction of {meta['page_count']} pages -> {out_dir / 'paper.text.v1.txt'}",
+            }
+        except (OSError, ValueError, KeyError):
+            pass  # unreadable entry: fall through and re-extract
 
-    pdf_hash = sha256_file(pdf_path)
-    text_hash = sha256_bytes(canon.encode('utf-8'))
+    reader = PdfReader(str(pdf_path))
+    page_count = len(reader.pages)
+    out_dir.mkdir(parents=True, exist_ok=True)
 
-    pages_json = json.dumps({"version": 1, "pages": pages}, ensure_ascii=False, indent=2) + "\n"
-    pages_hash = sha256_bytes(pages_json.encode("utf-8"))
+    n, text_hash, pages_hash = write_canonical_outputs(iter_raw_pages(reader, pdf_path, workers), out_dir)
 
     safe_write_text(out_dir / "paper.pdf.sha256", pdf_hash + "\n")
-    safe_write_text(out_dir / "paper.text.v1.txt", canon)
     safe_write_text(out_dir / "paper.text.v1.sha256", text_hash + "\n")
-    safe_write_text(out_dir / "paper.pages.v1.json", pages_json)
     safe_write_text(out_dir / "paper.pages.v1.sha256", pages_hash + "\n")
 
+    if entry is not None:
+        _store_in_cache(
+            entry,
+            out_dir,
+            {"page_count": page_count, "text_sha256": text_hash, "pages_sha256": pages_hash},
+        )
+
     return {
         "pdf": str(pdf_path),
         "out": str(out_dir),
         "pdf_sha256": pdf_hash,
         "text_sha256": text_hash,
         "pages_sha256": pages_hash,
-        "message": f"Extracted {len(reader.pages)} pages -> {out_dir / 'paper.text.v1.txt'}",
+        "cached": False,
+        "message": f"Extracted {page_count} pages -> {out_dir / 'paper.text.v1.txt'}",
     }
@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+"""Offline evidence grounding (semantic validation for the local engines).
+
+Checks that what the artifacts present as the paper's own words is in the
+paper: every quote under "Notable quotes" in paper-analysis.md and every
+quoted evidence cue in the scorecard notes is matched against the extracted
+pages.
+
+Text is normalized to NFKC, lowercased word tokens, so ligatures, curly
+quotes, hyphenation and line breaks do not matter. The pages are indexed
+once as word 3-gram shingles -> token positions; a quote's shingles vote for
+an alignment in the paper, so matching a quote costs the size of its
+postings, not the size of the paper. The best alignment is scored by the
+share of the quote's shingles found around it, which tolerates small
+extraction differences (split words, dropped footnote marks).
+
+The result has the semantic-validation.schema.json shape.
+"""
+
+import re
+import unicodedata
+from bisect import bisect_right
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Tuple
+
+# Recorded with results; bump when normalization or thresholds change.
+GROUNDING_VERSION = 1
+
+SHINGLE = 3
+# Share of a quote's shingles that must be found near its best alignment.
+GROUNDED_MIN = 0.8
+PARTIAL_MIN = 0.5
+# Shingles this common ("of the data") are skipped when voting, not when scoring.
+_MAX_POSTINGS = 64
+_CANDIDATES = 3
+# Cues shorter than this (quoted single terms) are not checked.
+_CUE_MIN_TOKENS = 4
+
+_WORD_RE = re.compile(r"[^\W_]+")
+_QUOTES_HEADING_RE = re.compile(r"^##\s+Notable quotes\s*$", re.IGNORECASE)
+# "- “quote” — why it matters" as rendered by dpi_lab.core.render.
+_QUOTE_ITEM_RE = re.compile(r"^\s*[-*]\s+[“\"](.+)[”\"](?:\s+[—-]+\s+.*)?$")
+_CUE_RE = re.compile(r"[“\"]([^“”\"]+)[”\"]")
+_EVIDENCE_KEYS = ("evidence", "quote", "quotes", "cue", "cues")
+
+
+def normalize_tokens(text: str) -> List[str]:
+    """Lowercased NFKC word tokens (punctuation and whitespace dropped)."""
+    return _WORD_RE.findall(unicodedata.normalize("NFKC", text).lower())
+
+
+@dataclass
+class GroundingMatch:
+    coverage: float
+    exact: bool
+    page: Optional[int]
+    excerpt: str
+
+
+class EvidenceIndex:
+    """Shingle index over a paper's pages, built once per validation run."""
+
+    def __init__(self, pages: List[Dict[str, Any]]) -> None:
+        self.tokens: List[str] = []
+        self.page_starts: List[int] = []
+        self.page_numbers: List[int] = []
+        for i, p in enumerate(pages, start=1):
+            self.page_starts.append(len(self.tokens))
+            self.page_numbers.append(int(p.get("page") or i))
+            self.tokens.extend(normalize_tokens(str(p.get("text") or "")))
+        # Shingles may span a page break, so quotes that do still match.
+        self.postings: Dict[Tuple[str, ...], List[int]] = defaultdict(list)
+        for pos, sh in enumerate(zip(*(self.tokens[k:] for k in range(SHINGLE)))):
+            self.postings[sh].append(pos)
+        self.unigrams: Dict[str, List[int]] = defaultdict(list)
+        for pos, tok in enumerate(self.tokens):
+            self.unigrams[tok].append(pos)
+
+    def _page(self, pos: int) -> Optional[int]:
+        if not self.page_starts:
+            return None
+        return self.page_numbers[max(0, bisect_right(self.page_starts, pos) - 1)]
+
+    def _excerpt(self, start: int, n: int) -> str:
+        return " ".join(self.tokens[max(0, start) : max(0, start) + n])
+
+    def match(self, text: str) -> GroundingMatch:
+        q = normalize_tokens(text)
+        if not q:
+            return GroundingMatch(coverage=0.0, exact=False, page=None, excerpt="")
+
+        if len(q) < SHINGLE:
+            for pos in self.unigrams.get(q[0], []):
+                if self.tokens[pos : pos + len(q)] == q:
+                    return GroundingMatch(coverage=1.0, exact=True, page=self._page(pos), excerpt=self._excerpt(pos, len(q)))
+            return GroundingMatch(coverage=0.0, exact=False, page=None, excerpt="")
+
+        shingles = list(zip(*(q[k:] for k in range(SHINGLE))))
+        posted = [(i, self.postings[sh]) for i, sh in enumerate(shingles) if sh in self.postings]
+        if not posted:
+            return GroundingMatch(coverage=0.0, exact=False, page=None, excerpt="")
+        # Each shingle found at position p votes for the quote starting at p - i.
+        selective = [(i, post) for i, post in posted if len(post) <= _MAX_POSTINGS] or posted
+        votes: Counter = Counter()
+        for i, post in selective:
+            votes.update(pos - i for pos in post)
+
+        best = GroundingMatch(coverage=0.0, exact=False, page=None, excerpt="")
+        wanted = Counter(shingles)
+        slack = max(2, len(shingles) // 10)
+        n_shingles = max(0, len(self.tokens) - SHINGLE + 1)
+        for start, _ in sorted(votes.items(), key=lambda kv: (-kv[1], kv[0]))[:_CANDIDATES]:
+            if start >= 0 and self.tokens[start : start + len(q)] == q:
+                return GroundingMatch(coverage=1.0, exact=True, page=self._page(start), excerpt=self._excerpt(start, len(q)))
+            lo, hi = max(0, start - slack), min(n_shingles, start + len(shingles) + slack)
+            window = Counter(tuple(self.tokens[k : k + SHINGLE]) for k in range(lo, hi))
+            found = sum(min(c, window[sh]) for sh, c in wanted.items())
+            m = GroundingMatch(
+                coverage=round(found / len(shingles), 4),
+                exact=False,
+                page=self._page(max(0, start)),
+                excerpt=self._excerpt(start, len(q)),
+            )
+            if m.coverage > best.coverage:
+                best = m
+        return best
+
+
+def analysis_quotes(analysis_md: str) -> List[str]:
+    """Quotes listed under "## Notable quotes" in paper-analysis.md."""
+    quotes: List[str] = []
+    in_section = False
+    for line in analysis_md.splitlines():
+        if line.startswith("#"):
+            in_section = bool(_QUOTES_HEADING_RE.match(line))
+            continue
+        m = _QUOTE_ITEM_RE.match(line) if in_section else None
+        if m:
+            quotes.append(m.group(1).strip())
+    return quotes
+
+
+def _cues_in(value: Any, *, whole: bool) -> List[str]:
+    if isinstance(value, str):
+        return [value] if whole else [m.group(1).strip() for m in _CUE_RE.finditer(value)]
+    if isinstance(value, list):
+        return [c for v in value for c in _cues_in(v, whole=whole)]
+    if isinstance(value, dict):
+        return [c for k, v in value.items() for c in _cues_in(v, whole=whole or str(k).lower() in _EVIDENCE_KEYS)]
+    return []
+
+
+def scorecard_cues(scorecard: Any) -> List[str]:
+    """Quoted evidence in scorecard notes: "..." spans in string notes, evidence/quote fields in object notes."""
+    notes = scorecard.get("notes") if isinstance(scorecard, dict) else None
+    cues = _cues_in(notes if isinstance(notes, list) else [], whole=False)
+    return [c for c in cues if len(normalize_tokens(c)) >= _CUE_MIN_TOKENS]
+
+
+def _is_placeholder(quote: str) -> bool:
+    q = quote.strip()
+    return not normalize_tokens(q) or (q.startswith("(") and q.endswith(")"))
+
+
+def _short(text: str, limit: int = 120) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[: limit - 3] + "..."
+
+
+def ground_artifacts(
+    artifacts: Dict[str, Any],
+    *,
+    pages: Optional[List[Dict[str, Any]]],
+    paper_text: str = "",
+) -> Dict[str, Any]:
+    """Semantic validation result (ok, issues, summary) for the evidence in artifacts.
+
+    Quotes and cues not found in the paper are errors; partial matches
+    (PARTIAL_MIN <= coverage < GROUNDED_MIN) and placeholder quotes are
+    warnings.
+    """
+    index = EvidenceIndex(pages or [{"page": 1, "text": paper_text}])
+    claims: List[Tuple[str, str, str]] = [("analysis", "quote", q) for q in analysis_quotes(artifacts.get("analysis_md") or "")]
+    claims += [("scorecard", "cue", c) for c in scorecard_cues(artifacts.get("scorecard"))]
+
+    issues: List[Dict[str, Any]] = []
+    checked: List[Dict[str, Any]] = []
+    grounded = 0
+    for artifact, kind, text in claims:
+        if kind == "quote" and _is_placeholder(text):
+            issues.append(
+                {
+                    "severity": "warning",
+                    "code": "placeholder_quote",
+                    "artifact": artifact,
+                    "message": f"Placeholder instead of a quote from the paper: {_short(text)!r}",
+                    "suggested_fix": "Replace it with a verbatim sentence from the paper.",
+                }
+            )
+            continue
+        m = index.match(text)
+        checked.append({"artifact": artifact, "kind": kind, "text": text, "coverage": m.coverage, "exact": m.exact, "page": m.page})
+        where = f" (closest: p. {m.page})" if m.page is not None else ""
+        if m.coverage >= GROUNDED_MIN:
+            grounded += 1
+        elif m.coverage >= PARTIAL_MIN:
+            issues.append(
+                {
+                    "severity": "warning",
+                    "code": "evidence_partial_match",
+                    "artifact": artifact,
+                    "message": f"{kind.capitalize()} only partly matches the paper ({m.coverage:.0%}){where}: {_short(text)!r}",
+                    "evidence": [m.excerpt],
+                    "suggested_fix": "Quote the passage verbatim from the paper.",
+                }
+            )
+        else:
+            issues.append(
+                {
+                    "severity": "error",
+                    "code": "evidence_not_found",
+                    "artifact": artifact,
+                    "message": f"{kind.capitalize()} not found in the paper ({m.coverage:.0%} match){where}: {_short(text)!r}",
+                    "evidence": [m.excerpt] if m.excerpt else [],
+                    "suggested_fix": "Replace it with a verbatim passage from the paper, or drop the quotation marks if it is a paraphrase.",
+                }
+            )
+
+    ok = not any(it["severity"] == "error" for it in issues)
+    summary = (
+        f"{grounded} of {len(checked)} quotes/cues grounded in {len(index.page_starts)} pages "
+        f"({sum(c['exact'] for c in checked)} exact); {len(issues)} issue(s)."
+    )
+    return {
+        "data": {"ok": ok, "issues": issues, "summary": summary},
+        "raw": {"grounding_version": GROUNDING_VERSION, "shingle": SHINGLE, "checked": checked},
+    }
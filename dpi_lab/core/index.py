@@ -0,0 +1,298 @@
+from __future__ import annotations
+
+"""SQLite corpus index over review scorecards, metadata and run manifests.
+
+One row per review directory in `reviews` (scores as columns, so plain SQL
+works: `SELECT title FROM reviews WHERE redress < 2`), tags in `tags`.
+
+Builds are incremental: each row records the sha256 of the three source
+files, and a directory is only re-parsed when one of them changed. Rows for
+directories that disappeared under the indexed root are dropped.
+"""
+
+import json
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from dpi_lab.core.utils import sha256_file
+
+# PRAGMA user_version of the database; a mismatch rebuilds from scratch.
+INDEX_SCHEMA_VERSION = 1
+
+SCORE_DIMENSIONS = (
+    "tiering_completeness",
+    "accountability_plumbing",
+    "data_governance",
+    "redress",
+    "sovereignty",
+)
+SOURCE_FILES = {
+    "scorecard": "paper-review-scorecard.yaml",
+    "metadata": "paper-review-metadata.yaml",
+    "manifest": "run/manifest.json",
+}
+# Columns usable in --where filters and --group-by.
+NUMERIC_FIELDS = SCORE_DIMENSIONS + ("year", "published_year")
+GROUP_FIELDS = ("batch", "year", "published_year", "engine", "model", "source", "tag")
+
+_SCHEMA = f"""
+CREATE TABLE reviews (
+    review_dir TEXT PRIMARY KEY,
+    batch TEXT NOT NULL,
+    scorecard_sha256 TEXT NOT NULL,
+    metadata_sha256 TEXT,
+    manifest_sha256 TEXT,
+    title TEXT,
+    year INTEGER,
+    published_year INTEGER,
+    source TEXT,
+    authors TEXT,
+    engine TEXT,
+    model TEXT,
+    pdf_sha256 TEXT,
+    text_sha256 TEXT,
+    pages_sha256 TEXT,
+    {", ".join(f"{d} INTEGER" for d in SCORE_DIMENSIONS)}
+);
+CREATE INDEX reviews_batch ON reviews(batch);
+CREATE INDEX reviews_year ON reviews(year);
+CREATE TABLE tags (
+    review_dir TEXT NOT NULL,
+    tag TEXT NOT NULL,
+    PRIMARY KEY (review_dir, tag)
+);
+CREATE INDEX tags_tag ON tags(tag);
+"""
+
+_WHERE_RE = re.compile(r"^\s*([a-z_]+)\s*(<=|>=|!=|==|=|<|>)\s*(-?\d+)\s*$")
+
+
+@dataclass
+class IndexBuildResult:
+    ok: bool
+    errors: List[str]
+    warnings: List[str]
+    added: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+
+@dataclass
+class IndexQueryResult:
+    columns: List[str]
+    rows: List[Tuple[Any, ...]]
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path))
+    version = conn.execute("PRAGMA user_version").fetchone()[0]
+    if version != INDEX_SCHEMA_VERSION:
+        with conn:
+            conn.execute("DROP TABLE IF EXISTS tags")
+            conn.execute("DROP TABLE IF EXISTS reviews")
+            conn.executescript(_SCHEMA)
+            conn.execute(f"PRAGMA user_version = {INDEX_SCHEMA_VERSION}")
+    return conn
+
+
+def _connect_readonly(db_path: Path) -> sqlite3.Connection:
+    if not db_path.is_file():
+        raise FileNotFoundError(f"Index not found: {db_path} (run `dpi-lab index build <root>` first)")
+    conn = sqlite3.connect(db_path.resolve().as_uri() + "?mode=ro", uri=True)
+    if conn.execute("PRAGMA user_version").fetchone()[0] != INDEX_SCHEMA_VERSION:
+        conn.close()
+        raise ValueError(f"Index {db_path} has an old schema; rebuild it with `dpi-lab index build`")
+    return conn
+
+
+def find_review_dirs(root: Path) -> List[Path]:
+    """Review directories under root (root itself if it is one), sorted."""
+    root = root.resolve()
+    if (root / SOURCE_FILES["scorecard"]).exists():
+        return [root]
+    return sorted(p.parent for p in root.rglob(SOURCE_FILES["scorecard"]))
+
+
+def _int_or_none(v: Any) -> Optional[int]:
+    return v if isinstance(v, int) and not isinstance(v, bool) else None
+
+
+def _row(review_dir: Path, hashes: Dict[str, Optional[str]]) -> Tuple[Dict[str, Any], List[str]]:
+    import yaml
+
+    sc = yaml.safe_load((review_dir / SOURCE_FILES["scorecard"]).read_text(encoding="utf-8"))
+    if not isinstance(sc, dict):
+        raise ValueError("scorecard is not a mapping")
+    md: Dict[str, Any] = {}
+    if hashes["metadata"]:
+        loaded = yaml.safe_load((review_dir / SOURCE_FILES["metadata"]).read_text(encoding="utf-8"))
+        md = loaded if isinstance(loaded, dict) else {}
+    mf: Dict[str, Any] = {}
+    if hashes["manifest"]:
+        loaded = json.loads((review_dir / SOURCE_FILES["manifest"]).read_text(encoding="utf-8"))
+        mf = loaded if isinstance(loaded, dict) else {}
+
+    paper = sc.get("paper") if isinstance(sc.get("paper"), dict) else {}
+    scores = sc.get("scores") if isinstance(sc.get("scores"), dict) else {}
+    inputs = mf.get("inputs") if isinstance(mf.get("inputs"), dict) else {}
+    authors = md.get("authors") if isinstance(md.get("authors"), list) else []
+    row: Dict[str, Any] = {
+        "review_dir": str(review_dir),
+        "batch": review_dir.parent.name,
+        "scorecard_sha256": hashes["scorecard"],
+        "metadata_sha256": hashes["metadata"],
+        "manifest_sha256": hashes["manifest"],
+        "title": str(md.get("title") or paper.get("title") or "") or None,
+        "year": _int_or_none(paper.get("year")),
+        "published_year": _int_or_none(md.get("published_year")),
+        "source": md.get("source") if isinstance(md.get("source"), str) else None,
+        "authors": json.dumps([str(a) for a in authors], ensure_ascii=False),
+        "engine": mf.get("engine"),
+        "model": mf.get("model"),
+        "pdf_sha256": inputs.get("pdf_sha256"),
+        "text_sha256": inputs.get("text_sha256"),
+        "pages_sha256": inputs.get("pages_sha256"),
+    }
+    for d in SCORE_DIMENSIONS:
+        row[d] = _int_or_none(scores.get(d))
+    tags = md.get("tags") if isinstance(md.get("tags"), list) else []
+    return row, sorted({str(t) for t in tags})
+
+
+def build_index(root: Path, db_path: Path) -> IndexBuildResult:
+    """Load (or refresh) every review directory under root into db_path.
+
+    Directories whose scorecard, metadata and manifest hashes match the stored
+    row are skipped without parsing YAML.
+    """
+    root = root.resolve()
+    errors: List[str] = []
+    warnings: List[str] = []
+    res = IndexBuildResult(ok=True, errors=errors, warnings=warnings)
+
+    review_dirs = find_review_dirs(root)
+    if not review_dirs:
+        warnings.append(f"No review directories found under: {root}")
+
+    conn = _connect(db_path)
+    try:
+        stored = {
+            r[0]: (r[1], r[2], r[3])
+            for r in conn.execute("SELECT review_dir, scorecard_sha256, metadata_sha256, manifest_sha256 FROM reviews")
+        }
+        seen = set()
+        with conn:
+            for d in review_dirs:
+                key = str(d)
+                seen.add(key)
+                hashes = {
+                    name: (sha256_file(d / rel) if (d / rel).is_file() else None) for name, rel in SOURCE_FILES.items()
+                }
+                if stored.get(key) == (hashes["scorecard"], hashes["metadata"], hashes["manifest"]):
+                    res.unchanged.append(key)
+                    continue
+                conn.execute("DELETE FROM tags WHERE review_dir = ?", (key,))
+                conn.execute("DELETE FROM reviews WHERE review_dir = ?", (key,))
+                try:
+                    row, tags = _row(d, hashes)
+                except Exception as ex:
+                    errors.append(f"{d}: {ex}")
+                    continue
+                cols = list(row)
+                conn.execute(
+                    f"INSERT INTO reviews ({', '.join(cols)}) VALUES ({', '.join('?' for _ in cols)})",
+                    [row[c] for c in cols],
+                )
+                conn.executemany("INSERT INTO tags (review_dir, tag) VALUES (?, ?)", [(key, t) for t in tags])
+                (res.updated if key in stored else res.added).append(key)
+
+            for key in sorted(stored):
+                p = Path(key)
+                if key not in seen and (p == root or root in p.parents):
+                    conn.execute("DELETE FROM tags WHERE review_dir = ?", (key,))
+                    conn.execute("DELETE FROM reviews WHERE review_dir = ?", (key,))
+                    res.removed.append(key)
+    finally:
+        conn.close()
+
+    res.ok = len(errors) == 0
+    return res
+
+
+def parse_where(expr: str) -> Tuple[str, str, int]:
+    """Parse a filter such as "redress<2" into (field, op, value)."""
+    m = _WHERE_RE.match(expr)
+    if not m or m.group(1) not in NUMERIC_FIELDS:
+        raise ValueError(f"Invalid filter {expr!r}: expected FIELD OP INT with FIELD in {', '.join(NUMERIC_FIELDS)}")
+    op = "=" if m.group(2) == "==" else m.group(2)
+    return m.group(1), op, int(m.group(3))
+
+
+def query_index(
+    db_path: Path,
+    *,
+    where: Sequence[str] = (),
+    tag: Optional[str] = None,
+    batch: Optional[str] = None,
+    engine: Optional[str] = None,
+    group_by: Optional[str] = None,
+    limit: Optional[int] = None,
+    sql: Optional[str] = None,
+) -> IndexQueryResult:
+    """Filtered listing or grouped aggregate over the index.
+
+    Without group_by: one row per matching review (title, year, batch, scores).
+    With group_by: papers per group and the mean of each score dimension.
+    sql runs a raw statement on a read-only connection instead.
+    """
+    conn = _connect_readonly(db_path)
+    try:
+        if sql:
+            try:
+                cur = conn.execute(sql)
+            except sqlite3.Error as ex:
+                raise ValueError(f"SQL error: {ex}") from ex
+            return IndexQueryResult(columns=[c[0] for c in cur.description or []], rows=cur.fetchall())
+
+        clauses: List[str] = []
+        params: List[Any] = []
+        for expr in where:
+            col, op, value = parse_where(expr)
+            clauses.append(f"r.{col} {op} ?")
+            params.append(value)
+        if tag is not None:
+            clauses.append("EXISTS (SELECT 1 FROM tags t WHERE t.review_dir = r.review_dir AND t.tag = ?)")
+            params.append(tag)
+        if batch is not None:
+            clauses.append("r.batch = ?")
+            params.append(batch)
+        if engine is not None:
+            clauses.append("r.engine = ?")
+            params.append(engine)
+        where_sql = f" WHERE {' AND '.join(clauses)}" if clauses else ""
+
+        if group_by is None:
+            cols = ["review_dir", "title", "year", "batch", *SCORE_DIMENSIONS]
+            stmt = f"SELECT {', '.join('r.' + c for c in cols)} FROM reviews r{where_sql} ORDER BY r.review_dir"
+        else:
+            if group_by not in GROUP_FIELDS:
+                raise ValueError(f"Invalid group-by {group_by!r}: expected one of {', '.join(GROUP_FIELDS)}")
+            key = "g.tag" if group_by == "tag" else f"r.{group_by}"
+            join = " JOIN tags g ON g.review_dir = r.review_dir" if group_by == "tag" else ""
+            means = ", ".join(f"ROUND(AVG(r.{d}), 2) AS {d}" for d in SCORE_DIMENSIONS)
+            cols = [group_by, "papers", *SCORE_DIMENSIONS]
+            stmt = (
+                f"SELECT {key} AS {group_by}, COUNT(*) AS papers, {means} FROM reviews r{join}{where_sql}"
+                f" GROUP BY {key} ORDER BY {key}"
+            )
+        if limit is not None:
+            stmt += " LIMIT ?"
+            params.append(limit)
+        return IndexQueryResult(columns=cols, rows=conn.execute(stmt, params).fetchall())
+    finally:
+        conn.close()
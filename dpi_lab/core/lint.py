@@ -1,8 +1,25 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+import json
+import operator
+import os
+import re
+from dataclasses import dataclass, field
+from itertools import compress, count, repeat
 from pathlib import Path
-from typing import Iterable, List
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from dpi_lab.core.utils import safe_write_text, sha256_bytes
+
+# Bump when the checks (or their messages) change so cached results are dropped.
+LINT_CACHE_VERSION = 1
+
+# Line boundaries as str.splitlines() sees them.
+_BREAKS = "\n\r\v\f\x1c\x1d\x1e\x85\u2028\u2029"
+_LINE_BREAK = re.compile(r"\r\n|[" + _BREAKS + "]")
+_TAB = re.compile(r"\t")
+# Whitespace (str.isspace) at the end of a line, excluding the line break itself.
+_TRAILING_WS = re.compile(r"[^\S" + _BREAKS + r"]+(?=\r\n|[" + _BREAKS + r"]|\Z)")
 
 
 @dataclass
@@ -10,20 +27,105 @@ class LintResult:
     ok: bool
     errors: List[str]
     warnings: List[str]
+    # Files linted in this run vs. answered from the result cache.
+    checked: List[str] = field(default_factory=list)
+    cached: List[str] = field(default_factory=list)
 
 
-def _iter_md_files(paths: Iterable[Path]) -> List[Path]:
-    out: List[Path] = []
+def _iter_md_files(paths: Iterable[Path]) -> List[str]:
+    out: set[str] = set()
     for p in paths:
         if p.is_dir():
-            out.extend(sorted(p.rglob("*.md")))
+            out.update(map(str, p.rglob("*.md")))
         elif p.is_file() and p.suffix.lower() == ".md":
-            out.append(p)
-    return out
+            out.add(str(p))
+    # Path order (component by component), without building Path objects.
+    return sorted(out, key=lambda s: s.split(os.sep))
+
+
+def _offending_lines(txt: str) -> set[Tuple[int, int]]:
+    """(line, rule) pairs with rule 0 = tab, 1 = trailing whitespace."""
+    if not any(c in txt for c in _BREAKS[1:]):
+        # LF-only (the common case): whole-buffer string ops, no per-line
+        # Python code. On typical files this beats the regex scan below, which
+        # has to try every space as a possible trailing run.
+        lines = txt.split("\n")
+        if not lines[-1]:
+            lines.pop()
+        found = {(n, 1) for n in compress(count(1), map(operator.ne, lines, map(str.rstrip, lines)))}
+        if "\t" in txt:
+            found.update((n, 0) for n in compress(count(1), map(operator.contains, lines, repeat("\t"))))
+        return found
+
+    # Other line breaks (CR, CRLF, form feed, ...): compiled regexes over the
+    # buffer, line numbers counted only up to each hit.
+    hits = sorted([(m.start(), 0) for m in _TAB.finditer(txt)] + [(m.start(), 1) for m in _TRAILING_WS.finditer(txt)])
+    found = set()
+    line, prev = 1, 0
+    for pos, rule in hits:
+        line += len(_LINE_BREAK.findall(txt, prev, pos))
+        prev = pos
+        found.add((line, rule))
+    return found
 
 
-def lint_markdown_paths(paths: Iterable[Path]) -> LintResult:
+def lint_markdown_text(txt: str, label: str) -> List[str]:
+    """Hygiene errors for one markdown document, in line order."""
     errors: List[str] = []
+    if "\r" in txt:
+        errors.append(f"{label}: contains CR characters (use LF newlines)")
+    for line, rule in sorted(_offending_lines(txt)):
+        what = "contains tab character" if rule == 0 else "trailing whitespace"
+        errors.append(f"{label}:{line}: {what}")
+    if not txt.endswith("\n"):
+        errors.append(f"{label}: file must end with a newline")
+    return errors
+
+
+def _lint_one(job: Tuple[str, Optional[str]]) -> Tuple[str, str, Optional[List[str]]]:
+    """Lint one file: (path, sha256, errors); errors is None if sha256 matched."""
+    # Module-level so it can run in a worker process.
+    path, known_sha = job
+    with open(path, "rb") as f:
+        data = f.read()
+    sha = sha256_bytes(data)
+    if sha == known_sha:
+        return path, sha, None
+    return path, sha, lint_markdown_text(data.decode("utf-8", errors="replace"), path)
+
+
+def _load_lint_cache(path: Path) -> Dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != LINT_CACHE_VERSION:
+        return {}
+    return data.get("entries") or {}
+
+
+def _save_lint_cache(path: Path, entries: Dict[str, Any]) -> None:
+    payload = {"version": LINT_CACHE_VERSION, "entries": dict(sorted(entries.items()))}
+    safe_write_text(path, json.dumps(payload, indent=2, ensure_ascii=False) + "\n")
+
+
+def lint_markdown_paths(
+    paths: Iterable[Path],
+    *,
+    jobs: int = 1,
+    cache_path: Path | None = None,
+) -> LintResult:
+    """Lint markdown files (directories are searched recursively).
+
+    Errors are reported in sorted file path order regardless of jobs.
+
+    jobs > 1 spreads files across a process pool.
+
+    With cache_path (e.g. .dpi-lab-cache/lint.json), per-file results are
+    keyed on mtime + size, then sha256: files whose mtime and size are
+    unchanged are not read; touched files with unchanged content are hashed
+    but not re-linted.
+    """
     warnings: List[str] = []
 
     files = _iter_md_files(paths)
@@ -31,17 +133,46 @@ def lint_markdown_paths(paths: Iterable[Path]) -> LintResult:
         warnings.append("No markdown files found")
         return LintResult(ok=True, errors=[], warnings=warnings)
 
-    for f in files:
-        txt = f.read_text(encoding="utf-8", errors="replace")
-        if "\r" in txt:
-            errors.append(f"{f}: contains CR characters (use LF newlines)")
-        lines = txt.splitlines()
-        for i, ln in enumerate(lines, start=1):
-            if "\t" in ln:
-                errors.append(f"{f}:{i}: contains tab character")
-            if ln.rstrip() != ln:
-                errors.append(f"{f}:{i}: trailing whitespace")
-        if not txt.endswith("\n"):
-            errors.append(f"{f}: file must end with a newline")
-
-    return LintResult(ok=(len(errors) == 0), errors=errors, warnings=warnings)
+    entries = _load_lint_cache(cache_path) if cache_path is not None else {}
+    results: Dict[str, List[str]] = {}
+    stats: Dict[str, Tuple[int, int]] = {}
+    job_list: List[Tuple[str, Optional[str]]] = []
+    for key in files:
+        hit = entries.get(key)
+        if cache_path is not None:
+            st = os.stat(key)
+            stats[key] = (st.st_mtime_ns, st.st_size)
+            if hit and (hit.get("mtime_ns"), hit.get("size")) == stats[key]:
+                results[key] = hit["errors"]
+                continue
+        job_list.append((key, hit.get("sha256") if hit else None))
+
+    workers = max(1, min(jobs, len(job_list)))
+    if workers == 1:
+        fresh = [_lint_one(job) for job in job_list]
+    else:
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(workers) as pool:
+            fresh = list(pool.map(_lint_one, job_list, chunksize=max(1, len(job_list) // (workers * 4))))
+
+    checked: List[str] = []
+    for key, sha, errs in fresh:
+        if errs is None:
+            errs = entries[key]["errors"]
+        else:
+            checked.append(key)
+        results[key] = errs
+        if cache_path is not None:
+            mtime_ns, size = stats[key]
+            entries[key] = {"mtime_ns": mtime_ns, "size": size, "sha256": sha, "errors": errs}
+
+    if cache_path is not None and fresh:
+        _save_lint_cache(cache_path, entries)
+
+    errors: List[str] = []
+    for key in files:
+        errors.extend(results[key])
+    fresh_keys = set(checked)
+    cached = [key for key in files if key not in fresh_keys]
+    return LintResult(ok=(len(errors) == 0), errors=errors, warnings=warnings, checked=checked, cached=cached)
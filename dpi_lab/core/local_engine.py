@@ -57,7 +57,7 @@ class LocalEngineAdapter(ReviewEngine):
 
     name = "local"
 
-    def generate(self, *, text: str, pdf_sha256: str, config: EngineConfig, pages=None) -> EngineResult:
+    def generate(self, *, text: str, pdf_sha256: str, config: EngineConfig, pages=None, prior_digests=None) -> EngineResult:
         # Reuse heuristics
         title, year = guess_title_and_year(text)
 
@@ -162,4 +162,7 @@ class LocalEngineAdapter(ReviewEngine):
         config: EngineConfig,
         pages=None,
     ) -> Dict[str, Any]:
-        raise NotImplementedError("Local engine does not support semantic validation")
+        # No model: check that quotes and evidence cues are grounded in the pages.
+        from dpi_lab.core.grounding import ground_artifacts
+
+        return ground_artifacts(artifacts, pages=pages, paper_text=paper_text)
@@ -0,0 +1,421 @@
+from __future__ import annotations
+
+"""Extractive local engine (engine=local-extractive).
+
+Offline and deterministic like the scaffold-only local engine, but grounded
+in the paper: every page is scored against a keyword profile per governance
+dimension, the best-matching sentences become quotes and score notes, and
+0-5 scores are derived from how much and how widely each dimension is
+discussed.
+
+Profiles are built once per process from built-in seed terms plus the risk
+names in data/risk-taxonomy.yaml and the control names in
+data/control-ids.csv (packaged under dpi_lab/resources/data). Page scoring
+is TF-IDF: a term found on every page says little about where a dimension
+is discussed, so it is weighted down.
+"""
+
+import csv
+import hashlib
+import io
+import json
+import math
+import re
+import threading
+import unicodedata
+from collections import Counter
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+from dpi_lab.core.local_engine import guess_title_and_year
+from dpi_lab.core.resources import read_text as read_resource_text
+from dpi_lab.engines.base import EngineConfig, EngineResult, ReviewEngine
+
+# Recorded in raw.json; bump when profiles or scoring change.
+EXTRACTIVE_VERSION = 1
+
+DIMENSION_LABELS = {
+    "tiering_completeness": "risk tiering",
+    "accountability_plumbing": "accountability",
+    "data_governance": "data governance",
+    "redress": "redress",
+    "sovereignty": "sovereignty",
+}
+SEED_TERMS: Dict[str, Tuple[str, ...]] = {
+    "tiering_completeness": (
+        "risk tier", "tiering", "risk based", "risk-based", "high risk", "high-risk", "risk classification",
+        "risk assessment", "impact assessment", "risk level", "proportionate", "criticality", "risk category",
+    ),
+    "accountability_plumbing": (
+        "accountability", "accountable", "audit", "audit trail", "oversight", "liability", "responsibility",
+        "transparency", "logging", "decision rights", "assurance", "conformance", "certification",
+    ),
+    "data_governance": (
+        "data governance", "data protection", "privacy", "consent", "data quality", "provenance", "data sharing",
+        "personal data", "data access", "anonymisation", "anonymization", "data retention", "data stewardship",
+    ),
+    "redress": (
+        "redress", "grievance", "appeal", "complaint", "remedy", "recourse", "contest", "ombudsman",
+        "dispute resolution", "human review", "right to explanation", "compensation",
+    ),
+    "sovereignty": (
+        "sovereignty", "sovereign", "localisation", "localization", "lock-in", "open source", "domestic compute",
+        "strategic autonomy", "supply chain", "dependency", "self-reliance", "digital public infrastructure",
+    ),
+}
+# control-ids.csv domain -> dimension whose profile gets the control's name.
+CONTROL_DOMAIN_DIMENSION = {
+    "TIER": "tiering_completeness",
+    "EVAL": "accountability_plumbing",
+    "OBS": "accountability_plumbing",
+    "DATA": "data_governance",
+    "RED": "redress",
+    "SUP": "sovereignty",
+}
+# Risk taxonomy entries are what a tiering scheme classifies.
+RISK_DIMENSION = "tiering_completeness"
+
+_STOPWORDS = frozenset("a an and the of to for in on or by with as at from is are be".split())
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Sentence ends: punctuation followed by whitespace.
+_SENTENCE_END_RE = re.compile(r"(?<=[.!?])\s+")
+_PARAGRAPH_RE = re.compile(r"\n\s*\n")
+# "--- PAGE N ---" lines that extraction puts between pages (see core.extract).
+_PAGE_MARKER_RE = re.compile(r"^\s*--- PAGE \d+ ---\s*$", re.MULTILINE)
+_MAX_NGRAM = 3
+_QUOTE_MIN_CHARS = 40
+_QUOTE_MAX_CHARS = 320
+
+_PROFILES: Optional["Profiles"] = None
+_LOCK = threading.Lock()
+
+
+def _read_data(name: str) -> str:
+    # Prefer packaged resources; fall back to the repo's data/ in source trees.
+    try:
+        return read_resource_text(f"data/{name}", encoding="utf-8")
+    except FileNotFoundError:
+        pass
+    repo_root = Path(__file__).resolve().parents[2]
+    return (repo_root / "data" / name).read_text(encoding="utf-8")
+
+
+def _stem(tok: str) -> str:
+    # Plural folding only; applied to text and profile terms alike.
+    return tok[:-1] if len(tok) > 3 and tok.endswith("s") and not tok.endswith("ss") else tok
+
+
+def _tokens(text: str) -> List[str]:
+    return [_stem(t) for t in _WORD_RE.findall(unicodedata.normalize("NFKC", text).lower())]
+
+
+def _term_key(phrase: str) -> Optional[Tuple[str, ...]]:
+    toks = tuple(t for t in _tokens(phrase) if t not in _STOPWORDS)
+    return toks if 0 < len(toks) <= _MAX_NGRAM else None
+
+
+@dataclass(frozen=True)
+class Profiles:
+    # dimension -> {term tokens: display phrase}
+    terms: Dict[str, Dict[Tuple[str, ...], str]]
+    # dimension -> ["RED-01 Redress SLAs", ...]
+    controls: Dict[str, List[str]]
+    sha256: str
+
+
+def load_profiles() -> Profiles:
+    """Keyword profiles per dimension (built once per process)."""
+    global _PROFILES
+    if _PROFILES is not None:
+        return _PROFILES
+
+    import yaml
+
+    phrases: Dict[str, List[str]] = {d: list(terms) for d, terms in SEED_TERMS.items()}
+    controls: Dict[str, List[str]] = {d: [] for d in SEED_TERMS}
+
+    taxonomy = yaml.safe_load(_read_data("risk-taxonomy.yaml")) or {}
+    for risk in taxonomy.get("risks") or []:
+        name = str(risk.get("name") or "")
+        # "Abuse / adversarial manipulation" is two terms, not one phrase.
+        phrases[RISK_DIMENSION].extend(name.split("/"))
+
+    for row in csv.DictReader(io.StringIO(_read_data("control-ids.csv"))):
+        dim = CONTROL_DOMAIN_DIMENSION.get((row.get("domain") or "").strip())
+        if dim is None:
+            continue
+        name = (row.get("name") or "").strip()
+        controls[dim].append(f"{row['control_id'].strip()} {name}")
+        phrases[dim].extend([name] + re.split(r"\band\b", name))
+
+    terms: Dict[str, Dict[Tuple[str, ...], str]] = {}
+    for dim, items in phrases.items():
+        terms[dim] = {}
+        for phrase in items:
+            key = _term_key(phrase)
+            if key is not None:
+                terms[dim].setdefault(key, " ".join(phrase.split()).lower())
+    blob = json.dumps({d: sorted(" ".join(k) for k in t) for d, t in terms.items()}, sort_keys=True)
+    profiles = Profiles(terms=terms, controls=controls, sha256=hashlib.sha256(blob.encode("utf-8")).hexdigest())
+    with _LOCK:
+        if _PROFILES is None:
+            _PROFILES = profiles
+    return _PROFILES
+
+
+def _page_counts(tokens: List[str], wanted: set) -> Counter:
+    """Occurrences of the wanted 1..3-gram terms in a token list."""
+    counts: Counter = Counter()
+    for n in range(1, _MAX_NGRAM + 1):
+        counts.update(g for g in zip(*(tokens[i:] for i in range(n))) if g in wanted)
+    return counts
+
+
+def _sentences(text: str) -> List[str]:
+    """Quotable sentences, whitespace-normalized but otherwise verbatim.
+
+    Line breaks are layout (some extractions put one between every word). A
+    run without sentence punctuation that is too long to quote (headings,
+    tables of contents) is split into paragraphs, then lines.
+    """
+    chunks = _SENTENCE_END_RE.split(text)
+    for splitter in (_PARAGRAPH_RE.split, str.splitlines):
+        chunks = [p for c in chunks for p in (splitter(c) if len(" ".join(c.split())) > _QUOTE_MAX_CHARS else [c])]
+    out = [" ".join(c.split()) for c in chunks]
+    return [s for s in out if _QUOTE_MIN_CHARS <= len(s) <= _QUOTE_MAX_CHARS and _is_prose(s)]
+
+
+def _is_prose(sentence: str) -> bool:
+    # Skip URLs, references and code-ish lines: mostly words, none of them links.
+    words = sentence.split()
+    if len(words) < 6 or any("://" in w or w.startswith("www.") for w in words):
+        return False
+    return sum(w.strip(".,;:()\"'“”‘’").isalpha() for w in words) >= 0.6 * len(words)
+
+
+def _score(hits: int, distinct: int, pages_hit: int, n_pages: int, n_tokens: int, profile_size: int) -> int:
+    """Heuristic 0-5 score from density, breadth and spread of term hits."""
+    if hits == 0:
+        return 0
+    density = hits * 1000.0 / max(1, n_tokens)  # hits per 1000 words
+    breadth = distinct / max(1, profile_size)  # share of the profile used
+    spread = pages_hit / max(1, n_pages)  # share of pages discussing it
+    x = 0.4 * min(1.0, density / 4.0) + 0.3 * min(1.0, breadth / 0.4) + 0.3 * min(1.0, spread / 0.25)
+    return max(1, min(5, int(round(5 * x))))
+
+
+class LocalExtractiveEngine(ReviewEngine):
+    """Deterministic extractive engine: keyword/TF-IDF page scoring, no model calls."""
+
+    name = "local-extractive"
+
+    def __init__(self, *, quotes_per_dimension: int = 2, top_pages: int = 3) -> None:
+        self.quotes_per_dimension = quotes_per_dimension
+        self.top_pages = top_pages
+
+    def analyze(self, text: str, pages: Optional[List[Dict[str, Any]]] = None) -> Dict[str, Any]:
+        """Per-dimension scores, evidence pages and evidence sentences."""
+        profiles = load_profiles()
+        if not pages:
+            pages = [{"page": 1, "text": text}]
+        page_nums = [int(p.get("page") or i) for i, p in enumerate(pages, start=1)]
+        page_texts = [str(p.get("text") or "") for p in pages]
+        wanted = {k for terms in profiles.terms.values() for k in terms}
+
+        page_tokens = [_tokens(t) for t in page_texts]
+        counts = [_page_counts(toks, wanted) for toks in page_tokens]
+        n_pages = len(pages)
+        n_tokens = sum(len(t) for t in page_tokens)
+        df = Counter(k for c in counts for k in c)
+        idf = {k: math.log((n_pages + 1) / (df[k] + 1)) + 1.0 for k in df}
+
+        dims: Dict[str, Any] = {}
+        for dim, terms in profiles.terms.items():
+            term_set = set(terms)
+            page_scores = []
+            total: Counter = Counter()
+            for i, c in enumerate(counts):
+                s = sum((1.0 + math.log(c[k])) * idf[k] for k in terms if c.get(k))
+                if s > 0:
+                    page_scores.append((s, i))
+                total.update({k: c[k] for k in terms if c.get(k)})
+            page_scores.sort(key=lambda x: (-x[0], x[1]))
+
+            # Evidence: best sentences on the best pages, weighted like pages.
+            evidence = []
+            for _, i in page_scores[: self.top_pages]:
+                for sent in _sentences(page_texts[i]):
+                    sc = _page_counts(_tokens(sent), term_set)
+                    if sc:
+                        w = sum(idf.get(k, 1.0) for k in sc)
+                        evidence.append({"page": page_nums[i], "sentence": sent, "weight": round(w, 4)})
+            evidence.sort(key=lambda e: (-e["weight"], e["page"], e["sentence"]))
+            seen: set = set()
+            picked = []
+            for e in evidence:
+                if e["sentence"] not in seen:
+                    seen.add(e["sentence"])
+                    picked.append(e)
+                if len(picked) == self.quotes_per_dimension:
+                    break
+
+            hits = sum(total.values())
+            dims[dim] = {
+                "score": _score(hits, len(total), len(page_scores), n_pages, n_tokens, len(terms)),
+                "hits": hits,
+                "pages_with_hits": len(page_scores),
+                "top_pages": [page_nums[i] for _, i in page_scores[: self.top_pages]],
+                "top_terms": [terms[k] for k, _ in sorted(total.items(), key=lambda kv: (-kv[1] * idf[kv[0]], kv[0]))[:5]],
+                "missing_terms": sorted(terms[k] for k in terms if k not in total)[:5],
+                "evidence": picked,
+            }
+        return {
+            "version": EXTRACTIVE_VERSION,
+            "profiles_sha256": profiles.sha256,
+            "pages": n_pages,
+            "tokens": n_tokens,
+            "dimensions": dims,
+        }
+
+    def generate(self, *, text: str, pdf_sha256: str, config: EngineConfig, pages=None, prior_digests=None) -> EngineResult:
+        # Page markers are not paper content; the title is the first real line.
+        title, year = guess_title_and_year(_PAGE_MARKER_RE.sub("", text))
+        a = self.analyze(text, pages)
+        dims: Dict[str, Dict[str, Any]] = a["dimensions"]
+        controls = load_profiles().controls
+        ranked = sorted(dims, key=lambda d: (-dims[d]["score"], -dims[d]["hits"], d))
+        weakest = list(reversed(ranked))
+
+        def label(d: str) -> str:
+            return DIMENSION_LABELS[d]
+
+        def where(d: str) -> str:
+            tp = dims[d]["top_pages"]
+            return f"p. {', '.join(str(p) for p in tp)}" if tp else "no pages"
+
+        quotes = [(d, e) for d in ranked for e in dims[d]["evidence"]]
+
+        notes: List[Any] = [
+            "Heuristic scores from keyword/TF-IDF page scoring (local-extractive engine, no model); "
+            "verify against the cited evidence before relying on them."
+        ]
+        for d in SEED_TERMS:
+            info = dims[d]
+            cue = f' Evidence: "{info["evidence"][0]["sentence"]}"' if info["evidence"] else ""
+            notes.append(
+                f"{d}: {info['score']}/5 from {info['hits']} term hits on {info['pages_with_hits']} of "
+                f"{a['pages']} pages ({where(d)}).{cue}"
+            )
+
+        metadata: Dict[str, Any] = {
+            "title": title,
+            "authors": [],
+            "published_year": year,
+            "source": "local-extractive",
+            "tags": ["generated", "deterministic", "local-extractive"]
+            + [label(d).replace(" ", "-") for d in ranked if dims[d]["score"] >= 3],
+        }
+        scorecard: Dict[str, Any] = {
+            "version": 0.1,
+            "paper": {"title": title, "year": year},
+            "scores": {d: dims[d]["score"] for d in SEED_TERMS},
+            "notes": notes,
+        }
+
+        summary = (
+            f"Extractive summary (local-extractive engine, no model judgement) of {a['pages']} pages. "
+            f"Strongest governance signals: {label(ranked[0])} ({dims[ranked[0]]['score']}/5, {where(ranked[0])}) and "
+            f"{label(ranked[1])} ({dims[ranked[1]]['score']}/5). Weakest: {label(weakest[0])} "
+            f"({dims[weakest[0]]['score']}/5)."
+        )
+        claims = [f"{e['sentence']} (p. {e['page']})" for _, e in quotes[:3]]
+        claims += [f"No extractable claim sentences for {label(d)}." for d in weakest][: max(0, 3 - len(claims))]
+        analysis: Dict[str, Any] = {
+            "executive_summary": summary,
+            "scope_and_claims": claims,
+            "methods_and_evidence": [
+                f"{label(d).capitalize()}: {dims[d]['hits']} term hits across {dims[d]['pages_with_hits']} pages "
+                f"({where(d)}); strongest terms: {', '.join(dims[d]['top_terms']) or 'none'}."
+                for d in ranked
+            ],
+            "assumptions": [
+                f"Coverage of {label(d)} ({dims[d]['score']}/5) never mentions "
+                f"{', '.join(dims[d]['missing_terms'][:3]) or 'further specifics'}; these are presumably assumed to be handled elsewhere."
+                for d in weakest[:3]
+            ],
+            "key_terms": [
+                {"term": t, "definition": f"Governance term for {label(d)}; among the most weighted matches in the paper."}
+                for d in ranked
+                for t in dims[d]["top_terms"][:1]
+            ]
+            or [{"term": label(d), "definition": f"Scored governance dimension ({d})."} for d in ranked],
+            "notable_quotes": [
+                {"quote": e["sentence"], "why_it_matters": f"Evidence for {label(d)} (p. {e['page']})."}
+                for d, e in quotes[:6]
+            ],
+        }
+        if len(analysis["key_terms"]) < 3:
+            analysis["key_terms"] += [
+                {"term": label(d), "definition": f"Scored governance dimension ({d})."} for d in ranked
+            ][: 3 - len(analysis["key_terms"])]
+        if len(analysis["notable_quotes"]) < 2:
+            analysis["notable_quotes"] += [
+                {"quote": "(No evidence sentence found; add quotes from the paper)", "why_it_matters": "Use as evidence anchors."}
+            ] * (2 - len(analysis["notable_quotes"]))
+
+        def control(d: str) -> str:
+            return ", ".join(controls.get(d) or []) or f"a documented {label(d)} control"
+
+        report: Dict[str, Any] = {
+            "executive_thesis": (
+                f"Extractive baseline review: the paper's text concentrates on {label(ranked[0])} and "
+                f"{label(ranked[1])}, while {label(weakest[0])} and {label(weakest[1])} receive the least coverage. "
+                "Scores are keyword-derived heuristics and should be confirmed by a reviewer."
+            ),
+            "strengths": [
+                f"Covers {label(d)} on {dims[d]['pages_with_hits']} pages ({where(d)}), score {dims[d]['score']}/5."
+                for d in ranked[:3]
+            ],
+            "gaps_and_omissions": [
+                f"{label(d).capitalize()}: {dims[d]['score']}/5 with {dims[d]['hits']} term hits; not found: "
+                f"{', '.join(dims[d]['missing_terms'][:3]) or 'n/a'}."
+                for d in weakest
+            ],
+            "risk_and_controls": [
+                {
+                    "risk": f"Weak {label(d)}",
+                    "why_it_matters": f"Only {dims[d]['hits']} supporting term hits ({dims[d]['score']}/5) in the paper.",
+                    "minimal_control": f"Bind {control(d)} to the deployment tier.",
+                }
+                for d in weakest
+            ],
+            "recommended_minimal_viable_upgrades": [
+                {
+                    "upgrade": f"Make {label(d)} explicit",
+                    "implementation_hint": f"Specify {control(d)}; cover: {', '.join(dims[d]['missing_terms'][:3]) or label(d)}.",
+                    "expected_impact": f"Raises {d} above {dims[d]['score']}/5 with citable evidence.",
+                }
+                for d in weakest
+            ],
+            "open_questions": [
+                f"Where does the paper address {label(d)} beyond the passages on {where(d)}?" for d in weakest[:3]
+            ],
+        }
+
+        raw = {"engine": self.name, **a}
+        return EngineResult(metadata=metadata, scorecard=scorecard, analysis=analysis, report=report, raw=raw)
+
+    def semantic_validate(
+        self,
+        *,
+        paper_text: str,
+        artifacts: Dict[str, Any],
+        pdf_sha256: str,
+        config: EngineConfig,
+        pages=None,
+    ) -> Dict[str, Any]:
+        # No model: check that quotes and evidence cues are grounded in the pages.
+        from dpi_lab.core.grounding import ground_artifacts
+
+        return ground_artifacts(artifacts, pages=pages, paper_text=paper_text)
@@ -1,19 +1,110 @@
 from __future__ import annotations
 
 import json
+import re
+import shutil
+from dataclasses import dataclass
 from pathlib import Path
 
+from typing import Any, Dict, List
+
 import yaml
 
 from dpi_lab.core.engines import get_engine
 from dpi_lab.core.extract import extract_pdf
 from dpi_lab.core.render import render_analysis_md, render_report_md
 from dpi_lab.core.scaffold import scaffold_review
-from dpi_lab.core.utils import safe_write_text
-from dpi_lab.engines.base import EngineConfig
+from dpi_lab.core.utils import safe_write_text, sha256_file
+from dpi_lab.engines.base import EngineConfig, EngineResult
 from dpi_lab import __version__
 
 
+def write_review_artifacts(review_dir: Path, result: EngineResult) -> Dict[str, Path]:
+    """Write the four contract artifacts from structured engine output."""
+
+    # Populate metadata.yaml
+    metadata_path = review_dir / "paper-review-metadata.yaml"
+    metadata_path.write_text(yaml.safe_dump(result.metadata, sort_keys=False), encoding="utf-8")
+
+    # Populate scorecard.yaml
+    scorecard_path = review_dir / "paper-review-scorecard.yaml"
+    scorecard_path.write_text(yaml.safe_dump(result.scorecard, sort_keys=False), encoding="utf-8")
+
+    # Render markdown from structured JSON
+    analysis_path = review_dir / "paper-analysis.md"
+    safe_write_text(analysis_path, render_analysis_md(result.analysis))
+
+    report_path = review_dir / "paper-review-report.md"
+    safe_write_text(report_path, render_report_md(result.report))
+
+    return {
+        "metadata": metadata_path,
+        "scorecard": scorecard_path,
+        "analysis": analysis_path,
+        "report": report_path,
+    }
+
+
+def write_run_payloads(review_dir: Path, raw: Dict[str, Any]) -> tuple[Path, Path]:
+    """Persist prompts and raw responses under run/ for audit and replay.
+
+    Nested prompt maps (e.g. per-chunk digest prompts) are written to a
+    subdirectory with one file per key.
+    """
+
+    run_dir = review_dir / "run"
+    prompts_dir = run_dir / "prompts"
+    responses_dir = run_dir / "responses"
+    prompts_dir.mkdir(parents=True, exist_ok=True)
+    responses_dir.mkdir(parents=True, exist_ok=True)
+
+    if isinstance(raw, dict) and "prompts" in raw:
+        for k, v in raw.get("prompts", {}).items():
+            if isinstance(v, dict):
+                for sub, prompt in v.items():
+                    safe_write_text(prompts_dir / k / f"{sub}.txt", prompt)
+            else:
+                safe_write_text(prompts_dir / f"{k}.txt", v)
+    safe_write_text(responses_dir / "raw.json", json.dumps(raw, indent=2, ensure_ascii=False) + "\n")
+    return prompts_dir, responses_dir
+
+
+def load_prior_digests(review_dir: Path) -> tuple[str | None, List[Dict[str, Any]]]:
+    """Load chunk digests persisted by a previous model-backed review.
+
+    Returns (model, digests) where each digest entry is
+    {"chunk_id", "start_page", "end_page", "sha256", "digest"} in chunk order,
+    read from run/responses/raw.json.
+    """
+
+    raw_path = review_dir / "run" / "responses" / "raw.json"
+    if not raw_path.exists():
+        raise FileNotFoundError(f"No persisted responses at {raw_path}")
+    raw = json.loads(raw_path.read_text(encoding="utf-8"))
+    manifest_path = review_dir / "run" / "manifest.json"
+    model = None
+    if manifest_path.exists():
+        model = json.loads(manifest_path.read_text(encoding="utf-8")).get("model")
+
+    digests = raw.get("chunk_digests") or []
+    tree = (raw.get("chunking") or {}).get("reduce_tree") or []
+    if tree and all("sha256" in n for n in tree[0]):
+        chunks = [(n["chunk_id"], n["pages"][0], n["pages"][1], n["sha256"]) for n in tree[0]]
+    else:
+        # Older runs: recover chunk provenance from the persisted digest prompts.
+        chunks = []
+        for cid, prompt in ((raw.get("prompts") or {}).get("chunk_digests") or {}).items():
+            m = re.search(r"pages=(\d+)-(\d+); chunk_sha256=([0-9a-f]{64})", prompt)
+            if m:
+                chunks.append((cid, int(m.group(1)), int(m.group(2)), m.group(3)))
+    if len(chunks) != len(digests):
+        raise ValueError(f"Cannot match chunk digests to chunks in {raw_path}")
+    return model, [
+        {"chunk_id": cid, "start_page": a, "end_page": b, "sha256": sha, "digest": d}
+        for (cid, a, b, sha), d in zip(chunks, digests)
+    ]
+
+
 def run_review(
     pdf_path: Path,
     base_dir: Path,
@@ -23,8 +114,14 @@ def run_review(
     max_input_chars: int = 180_000,
     chunk_max_chars: int = 60_000,
     chunk_max_count: int = 12,
+    chunk_strategy: str = "greedy",
+    reduce_fan_in: int = 4,
     max_input_tokens: int | None = None,
     chunk_max_tokens: int | None = None,
+    map_concurrency: int = 4,
+    cache_dir: Path | None = None,
+    extract_workers: int = 1,
+    incremental_from: Path | None = None,
 ) -> Path:
     """End-to-end review pipeline.
 
@@ -36,13 +133,37 @@ def run_review(
 
     This keeps the repo runnable for any user while preserving a stable
     contract for future model-backed engines.
+
+    cache_dir is the workbench cache root; extraction outputs are cached under
+    cache_dir/extract and model responses under cache_dir/responses. None
+    disables caching.
+
+    incremental_from is a previous review directory (e.g. of an earlier
+    edition); its chunk digests are reused for chunks whose text is unchanged.
     """
 
+    prior_digests = None
+    if incremental_from is not None:
+        prior_model, prior_digests = load_prior_digests(incremental_from)
+        if prior_model is not None and prior_model != (model or "gpt-5"):
+            raise ValueError(
+                f"Cannot reuse digests from {incremental_from}: produced by model {prior_model!r}, not {model or 'gpt-5'!r}"
+            )
+
     review_dir = scaffold_review(base_dir=base_dir, slug=slug, pdf_path=pdf_path)
+    # scaffold_review keeps an existing paper.pdf; refresh it if the source changed.
+    review_pdf = review_dir / "paper.pdf"
+    if pdf_path.resolve() != review_pdf and sha256_file(pdf_path) != sha256_file(review_pdf):
+        shutil.copyfile(pdf_path, review_pdf)
 
     # Extract
     extracted_dir = review_dir / "extracted"
-    res = extract_pdf(pdf_path=review_dir / "paper.pdf", out_dir=extracted_dir)
+    res = extract_pdf(
+        pdf_path=review_dir / "paper.pdf",
+        out_dir=extracted_dir,
+        workers=extract_workers,
+        cache_dir=cache_dir / "extract" if cache_dir is not None else None,
+    )
 
     # Engine (local or model-backed)
     paper_text = (extracted_dir / "paper.text.v1.txt").read_text(encoding="utf-8")
@@ -61,38 +182,26 @@ def run_review(
         max_input_chars=max_input_chars,
         chunk_max_chars=chunk_max_chars,
         chunk_max_count=chunk_max_count,
+        chunk_strategy=chunk_strategy,
+        reduce_fan_in=reduce_fan_in,
         max_input_tokens=max_input_tokens,
         chunk_max_tokens=chunk_max_tokens,
+        map_concurrency=map_concurrency,
+        cache_dir=str(cache_dir / "responses") if cache_dir is not None else None,
+        token_counts_path=str(extracted_dir / "paper.tokens.v1.json"),
+    )
+    result = eng.generate(
+        text=paper_text, pdf_sha256=res["pdf_sha256"], config=cfg, pages=pages, prior_digests=prior_digests
     )
-    result = eng.generate(text=paper_text, pdf_sha256=res["pdf_sha256"], config=cfg, pages=pages)
-
-    # Populate metadata.yaml
-    metadata_path = review_dir / "paper-review-metadata.yaml"
-    metadata_path.write_text(yaml.safe_dump(result.metadata, sort_keys=False), encoding="utf-8")
-
-    # Populate scorecard.yaml
-    scorecard_path = review_dir / "paper-review-scorecard.yaml"
-    scorecard_path.write_text(yaml.safe_dump(result.scorecard, sort_keys=False), encoding="utf-8")
-
-    # Render markdown from structured JSON
-    analysis_path = review_dir / "paper-analysis.md"
-    safe_write_text(analysis_path, render_analysis_md(result.analysis))
 
-    report_path = review_dir / "paper-review-report.md"
-    safe_write_text(report_path, render_report_md(result.report))
+    outputs = write_review_artifacts(review_dir, result)
+    metadata_path = outputs["metadata"]
+    scorecard_path = outputs["scorecard"]
+    analysis_path = outputs["analysis"]
+    report_path = outputs["report"]
 
     # Persist prompts + raw responses for audit/replay
-    run_dir = review_dir / "run"
-    prompts_dir = run_dir / "prompts"
-    responses_dir = run_dir / "responses"
-    prompts_dir.mkdir(parents=True, exist_ok=True)
-    responses_dir.mkdir(parents=True, exist_ok=True)
-
-    raw = result.raw
-    if isinstance(raw, dict) and "prompts" in raw:
-        for k, v in raw.get("prompts", {}).items():
-            safe_write_text(prompts_dir / f"{k}.txt", v)
-    safe_write_text(responses_dir / "raw.json", json.dumps(raw, indent=2, ensure_ascii=False) + "\n")
+    prompts_dir, responses_dir = write_run_payloads(review_dir, result.raw)
 
     # Manifest
     manifest_path = review_dir / "run" / "manifest.json"
@@ -106,6 +215,8 @@ def run_review(
             "max_input_chars": cfg.max_input_chars,
             "chunk_max_chars": cfg.chunk_max_chars,
             "chunk_max_count": cfg.chunk_max_count,
+            "chunk_strategy": cfg.chunk_strategy,
+            "reduce_fan_in": cfg.reduce_fan_in,
             "max_input_tokens": cfg.max_input_tokens,
             "chunk_max_tokens": cfg.chunk_max_tokens,
         },
@@ -114,6 +225,18 @@ def run_review(
             "repair_retries": cfg.repair_retries,
             "temperature": cfg.temperature,
             "top_p": cfg.top_p,
+            "map_concurrency": cfg.map_concurrency,
+        },
+        "extraction_cache": {"enabled": cache_dir is not None, "hit": bool(res.get("cached"))},
+        # Only engines that consult the response cache report it (local engines never do).
+        "response_cache": result.stats.get("response_cache", {"enabled": False}),
+        "token_counts": result.stats.get("token_counts"),
+        "incremental": None
+        if incremental_from is None
+        else {
+            "previous": str(incremental_from.resolve()),
+            "reused_chunks": len(result.raw.get("chunking", {}).get("reused_chunks", [])),
+            "digests_count": result.raw.get("chunking", {}).get("digests_count", 0),
         },
         "inputs": {
             "pdf": str((review_dir / "paper.pdf").resolve()),
@@ -134,3 +257,68 @@ def run_review(
     safe_write_text(manifest_path, json.dumps(manifest, indent=2) + "\n")
 
     return review_dir
+
+
+@dataclass
+class RerenderResult:
+    rendered: List[Path]
+    skipped: List[str]
+    errors: List[str]
+
+
+def rerender_review(review_dir: Path) -> Path:
+    """Rebuild the contract artifacts of a review from its persisted run/ data.
+
+    The stored payloads in run/responses/raw.json are replayed through the
+    renderers and YAML writers; no network access and no tokenizer. raw.json
+    and prompts are left as-is; the manifest records the re-rendering version.
+    """
+
+    review_dir = review_dir.resolve()
+    manifest_path = review_dir / "run" / "manifest.json"
+    manifest: Dict[str, Any] = {}
+    if manifest_path.exists():
+        manifest = json.loads(manifest_path.read_text(encoding="utf-8"))
+
+    cfg = EngineConfig(model=manifest.get("model") or "gpt-5", seed=int(manifest.get("seed") or 0))
+    pdf_sha = manifest.get("inputs", {}).get("pdf_sha256", "")
+    result = get_engine("replay", review_dir=review_dir).generate(text="", pdf_sha256=pdf_sha, config=cfg)
+
+    write_review_artifacts(review_dir, result)
+
+    if manifest:
+        manifest["rerender"] = {"workbench_version": __version__}
+        safe_write_text(manifest_path, json.dumps(manifest, indent=2) + "\n")
+
+    return review_dir
+
+
+def rerender_tree(root: Path) -> RerenderResult:
+    """Re-render a single review directory or every review under a tree.
+
+    Review directories are those with a run/manifest.json. Local-engine
+    reviews have no stored responses (and are usually completed by hand), so
+    they are skipped. Failures are collected per directory.
+    """
+
+    root = root.resolve()
+    if (root / "run" / "manifest.json").exists():
+        review_dirs = [root]
+    else:
+        review_dirs = sorted(p.parent.parent for p in root.rglob("run/manifest.json"))
+
+    rendered: List[Path] = []
+    skipped: List[str] = []
+    errors: List[str] = []
+    for d in review_dirs:
+        try:
+            engine = json.loads((d / "run" / "manifest.json").read_text(encoding="utf-8")).get("engine")
+            if engine in {None, "local", "local-extractive"}:
+                skipped.append(f"{d}: engine '{engine}' has no stored model responses")
+                continue
+            rendered.append(rerender_review(d))
+        except Exception as ex:
+            errors.append(f"{d}: {ex}")
+    if not review_dirs:
+        errors.append(f"No review directories found under: {root}")
+    return RerenderResult(rendered=rendered, skipped=skipped, errors=errors)
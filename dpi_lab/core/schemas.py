@@ -1,21 +1,25 @@
 from __future__ import annotations
 
+import hashlib
 import json
+import threading
 from pathlib import Path
 
 from dpi_lab.core.resources import read_text as read_resource_text
-from typing import Any, Dict
+from typing import Any, Dict, Optional, Tuple
 
+# Process-wide caches. Schemas are treated as read-only once loaded; callers
+# must not mutate the returned dicts.
+_SCHEMAS: Dict[str, Dict[str, Any]] = {}
+_VALIDATORS: Dict[Tuple[str, str, str], Any] = {}
+# Identity fast path: (id(schema), rel_path, class) -> (schema, validator). The
+# schema reference keeps the id valid; bounded since callers may pass fresh dicts.
+_BY_ID: Dict[Tuple[int, str, str], Tuple[Dict[str, Any], Any]] = {}
+_BY_ID_MAX = 256
+_LOCK = threading.Lock()
 
-def load_schema(rel_path: str) -> Dict[str, Any]:
-    """Load a JSON schema.
-
-    rel_path is relative to the repository root, e.g.:
-      - "schemas/reviews/paper-review-scorecard.schema.json"
 
-    For pip installs, schemas are loaded from packaged resources under dpi_lab/resources/.
-    For editable installs, we fall back to repo-relative paths.
-    """
+def _read_schema(rel_path: str) -> Dict[str, Any]:
     # Prefer packaged resources
     if rel_path.startswith("schemas/"):
         res_rel = rel_path[len("schemas/"):]
@@ -27,3 +31,74 @@ def load_schema(rel_path: str) -> Dict[str, Any]:
     repo_root = Path(__file__).resolve().parents[2]
     p = repo_root / rel_path
     return json.loads(p.read_text(encoding="utf-8"))
+
+
+def load_schema(rel_path: str) -> Dict[str, Any]:
+    """Load a JSON schema.
+
+    rel_path is relative to the repository root, e.g.:
+      - "schemas/reviews/paper-review-scorecard.schema.json"
+
+    For pip installs, schemas are loaded from packaged resources under dpi_lab/resources/.
+    For editable installs, we fall back to repo-relative paths.
+
+    Schemas are read once per process; the returned dict is shared.
+    """
+    schema = _SCHEMAS.get(rel_path)
+    if schema is None:
+        schema = _read_schema(rel_path)
+        with _LOCK:
+            schema = _SCHEMAS.setdefault(rel_path, schema)
+    return schema
+
+
+def schema_sha256(schema: Dict[str, Any]) -> str:
+    """Content hash of a schema (key order independent)."""
+    blob = json.dumps(schema, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(blob.encode("utf-8")).hexdigest()
+
+
+def get_validator(schema: Dict[str, Any], *, rel_path: str = "", cls: Optional[type] = None) -> Any:
+    """Return a compiled jsonschema validator, cached per process.
+
+    The cache key is (rel_path, schema content hash, validator class), so
+    in-memory schemas (rel_path="") and edited schema files get their own
+    entries. cls defaults to the class declared by the schema's $schema, as
+    jsonschema.validate does; the schema itself is checked once, on compile.
+    """
+    from jsonschema.validators import validator_for
+
+    id_key = (id(schema), rel_path, cls.__name__ if cls else "")
+    hit = _BY_ID.get(id_key)
+    if hit is not None and hit[0] is schema:
+        return hit[1]
+
+    vcls = cls or validator_for(schema)
+    key = (rel_path, schema_sha256(schema), vcls.__name__)
+    validator = _VALIDATORS.get(key)
+    if validator is None:
+        vcls.check_schema(schema)
+        validator = vcls(schema)
+    with _LOCK:
+        validator = _VALIDATORS.setdefault(key, validator)
+        if len(_BY_ID) >= _BY_ID_MAX:
+            _BY_ID.clear()
+        _BY_ID[id_key] = (schema, validator)
+    return validator
+
+
+def load_validator(rel_path: str, *, cls: Optional[type] = None) -> Any:
+    """load_schema + get_validator for a schema file."""
+    return get_validator(load_schema(rel_path), rel_path=rel_path, cls=cls)
+
+
+def validate_instance(instance: Any, schema: Dict[str, Any], *, rel_path: str = "") -> None:
+    """Drop-in for jsonschema.validate using the cached validator.
+
+    Raises jsonschema.ValidationError (the best match) if instance is invalid.
+    """
+    from jsonschema.exceptions import best_match
+
+    error = best_match(get_validator(schema, rel_path=rel_path).iter_errors(instance))
+    if error is not None:
+        raise error
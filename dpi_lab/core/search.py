@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+"""Full-text BM25 search over extracted pages (dpi-lab search).
+
+Every `extracted/paper.pages.v1.json` under a tree is indexed page by page
+into a SQLite FTS5 table: an on-disk inverted index with BM25 ranking and
+snippet extraction built in, so a query is a single indexed lookup.
+
+Builds are incremental on pages_sha256 (from run/manifest.json, falling back
+to the extraction sidecar or the file itself): only new or changed papers
+are re-indexed, and papers that disappeared under the root are dropped.
+"""
+
+import json
+import re
+import sqlite3
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, List, Optional, Tuple
+
+from dpi_lab.core.utils import sha256_file
+
+# PRAGMA user_version of the database; a mismatch rebuilds from scratch.
+SEARCH_SCHEMA_VERSION = 1
+PAGES_FILE = "extracted/paper.pages.v1.json"
+
+_SCHEMA = """
+CREATE TABLE papers (
+    id INTEGER PRIMARY KEY,
+    review_dir TEXT NOT NULL UNIQUE,
+    pages_sha256 TEXT NOT NULL,
+    page_count INTEGER NOT NULL
+);
+CREATE TABLE page_rows (
+    rowid INTEGER PRIMARY KEY,
+    paper_id INTEGER NOT NULL,
+    page INTEGER NOT NULL
+);
+CREATE INDEX page_rows_paper ON page_rows(paper_id);
+CREATE VIRTUAL TABLE pages USING fts5(text, tokenize = 'porter unicode61 remove_diacritics 2');
+"""
+
+_WORD_RE = re.compile(r"\w")
+
+
+@dataclass
+class SearchBuildResult:
+    ok: bool
+    errors: List[str]
+    warnings: List[str]
+    added: List[str] = field(default_factory=list)
+    updated: List[str] = field(default_factory=list)
+    unchanged: List[str] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)
+
+
+@dataclass
+class SearchHit:
+    review_dir: str
+    page: int
+    score: float
+    snippet: str
+
+
+def _connect(db_path: Path) -> sqlite3.Connection:
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    conn = sqlite3.connect(str(db_path))
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SEARCH_SCHEMA_VERSION:
+        with conn:
+            for table in ("pages", "page_rows", "papers"):
+                conn.execute(f"DROP TABLE IF EXISTS {table}")
+            try:
+                conn.executescript(_SCHEMA)
+            except sqlite3.OperationalError as ex:
+                raise RuntimeError(f"SQLite FTS5 is required for dpi-lab search: {ex}") from ex
+            conn.execute(f"PRAGMA user_version = {SEARCH_SCHEMA_VERSION}")
+    return conn
+
+
+def _pages_sha256(review_dir: Path) -> str:
+    """pages_sha256 recorded for a review, hashing the file only as a last resort."""
+    manifest = review_dir / "run" / "manifest.json"
+    if manifest.is_file():
+        try:
+            sha = (json.loads(manifest.read_text(encoding="utf-8")).get("inputs") or {}).get("pages_sha256")
+        except (OSError, ValueError, AttributeError):
+            sha = None
+        if isinstance(sha, str) and sha:
+            return sha
+    sidecar = review_dir / "extracted" / "paper.pages.v1.sha256"
+    if sidecar.is_file():
+        sha = sidecar.read_text(encoding="utf-8").strip()
+        if sha:
+            return sha
+    return sha256_file(review_dir / PAGES_FILE)
+
+
+def find_paged_reviews(root: Path) -> List[Path]:
+    """Review directories under root (or root itself) that have extracted pages, sorted."""
+    root = root.resolve()
+    if (root / PAGES_FILE).is_file():
+        return [root]
+    return sorted(p.parent.parent for p in root.rglob("paper.pages.v1.json") if p.parent.name == "extracted")
+
+
+def _delete_paper(conn: sqlite3.Connection, paper_id: int) -> None:
+    conn.execute("DELETE FROM pages WHERE rowid IN (SELECT rowid FROM page_rows WHERE paper_id = ?)", (paper_id,))
+    conn.execute("DELETE FROM page_rows WHERE paper_id = ?", (paper_id,))
+    conn.execute("DELETE FROM papers WHERE id = ?", (paper_id,))
+
+
+def build_search_index(root: Path, db_path: Path) -> SearchBuildResult:
+    """Index (or refresh) the extracted pages of every review under root."""
+    root = root.resolve()
+    errors: List[str] = []
+    warnings: List[str] = []
+    res = SearchBuildResult(ok=True, errors=errors, warnings=warnings)
+
+    review_dirs = find_paged_reviews(root)
+    if not review_dirs:
+        warnings.append(f"No {PAGES_FILE} found under: {root}")
+
+    conn = _connect(db_path)
+    try:
+        stored = {r[1]: (r[0], r[2]) for r in conn.execute("SELECT id, review_dir, pages_sha256 FROM papers")}
+        seen = set()
+        with conn:
+            for d in review_dirs:
+                key = str(d)
+                seen.add(key)
+                try:
+                    sha = _pages_sha256(d)
+                    if key in stored and stored[key][1] == sha:
+                        res.unchanged.append(key)
+                        continue
+                    pages = json.loads((d / PAGES_FILE).read_text(encoding="utf-8")).get("pages") or []
+                except (OSError, ValueError, AttributeError) as ex:
+                    errors.append(f"{d}: {ex}")
+                    continue
+
+                if key in stored:
+                    _delete_paper(conn, stored[key][0])
+                paper_id = conn.execute(
+                    "INSERT INTO papers (review_dir, pages_sha256, page_count) VALUES (?, ?, ?)", (key, sha, len(pages))
+                ).lastrowid
+                for p in pages:
+                    text = str(p.get("text") or "")
+                    if not text.strip():
+                        continue
+                    rowid = conn.execute(
+                        "INSERT INTO page_rows (paper_id, page) VALUES (?, ?)", (paper_id, int(p.get("page") or 0))
+                    ).lastrowid
+                    conn.execute("INSERT INTO pages (rowid, text) VALUES (?, ?)", (rowid, text))
+                (res.updated if key in stored else res.added).append(key)
+
+            for key in sorted(stored):
+                p = Path(key)
+                if key not in seen and (p == root or root in p.parents):
+                    _delete_paper(conn, stored[key][0])
+                    res.removed.append(key)
+
+            if res.added or res.updated or res.removed:
+                # Merge the FTS b-trees so the on-disk index stays compact.
+                conn.execute("INSERT INTO pages (pages) VALUES ('optimize')")
+    finally:
+        conn.close()
+
+    res.ok = len(errors) == 0
+    return res
+
+
+def _match_expr(query: str, any_term: bool) -> str:
+    # Each whitespace-separated word becomes an FTS5 string, so punctuation
+    # never reaches the query parser and "DPI-AI" matches as a phrase.
+    terms = [w for w in query.split() if _WORD_RE.search(w)]
+    if not terms:
+        raise ValueError(f"Query has no searchable terms: {query!r}")
+    return (" OR " if any_term else " ").join('"' + t.replace('"', '""') + '"' for t in terms)
+
+
+def search(
+    db_path: Path,
+    query: str,
+    *,
+    limit: int = 10,
+    any_term: bool = False,
+    review: Optional[str] = None,
+    snippet_tokens: int = 16,
+) -> List[SearchHit]:
+    """Top pages for query by BM25 (best first).
+
+    Query words are matched as terms (stemmed, case- and accent-insensitive);
+    all must occur on the page unless any_term is set. review restricts hits
+    to review directories containing that substring.
+    """
+    if not db_path.is_file():
+        raise FileNotFoundError(f"Search index not found: {db_path} (run `dpi-lab search build <root>` first)")
+    conn = sqlite3.connect(db_path.resolve().as_uri() + "?mode=ro", uri=True)
+    try:
+        if conn.execute("PRAGMA user_version").fetchone()[0] != SEARCH_SCHEMA_VERSION:
+            raise ValueError(f"Search index {db_path} has an old schema; rebuild it with `dpi-lab search build`")
+        params: List[Any] = [snippet_tokens, _match_expr(query, any_term)]
+        review_sql = ""
+        if review:
+            review_sql = " AND instr(p.review_dir, ?) > 0"
+            params.append(review)
+        params.append(limit)
+        rows: List[Tuple[str, int, float, str]] = conn.execute(
+            "SELECT p.review_dir, r.page, bm25(pages) AS rank, snippet(pages, 0, '[', ']', ' ... ', ?)"
+            " FROM pages JOIN page_rows r ON r.rowid = pages.rowid JOIN papers p ON p.id = r.paper_id"
+            f" WHERE pages MATCH ?{review_sql} ORDER BY rank, p.review_dir, r.page LIMIT ?",
+            params,
+        ).fetchall()
+    finally:
+        conn.close()
+    # FTS5 bm25() is negated so that ORDER BY puts the best match first.
+    return [SearchHit(review_dir=d, page=page, score=round(-rank, 4), snippet=" ".join(s.split())) for d, page, rank, s in rows]
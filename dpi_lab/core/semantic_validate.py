@@ -8,8 +8,25 @@ from typing import Any, Dict, List, Optional
 import yaml
 
 from dpi_lab.core.engines import get_engine
+from dpi_lab.core.grounding import GROUNDING_VERSION
 from dpi_lab.engines.base import EngineConfig
-from dpi_lab.core.utils import safe_write_text
+from dpi_lab.core.utils import safe_write_text, sha256_file
+
+# Bump when the semantic validation prompt template (or its inputs) changes, so
+# stamped results in run/semantic-validation.json are not reused.
+SEMANTIC_PROMPT_VERSION = 1
+
+# Engines whose semantic validation is the offline grounding check.
+LOCAL_ENGINES = {"local", "local-extractive"}
+
+SEMANTIC_INPUT_FILES = {
+    "text": "extracted/paper.text.v1.txt",
+    "pages": "extracted/paper.pages.v1.json",
+    "metadata": "paper-review-metadata.yaml",
+    "scorecard": "paper-review-scorecard.yaml",
+    "analysis": "paper-analysis.md",
+    "report": "paper-review-report.md",
+}
 
 
 @dataclass
@@ -17,6 +34,8 @@ class SemanticValidation:
     errors: List[str]
     warnings: List[str]
     output_path: Optional[Path] = None
+    # True when a stamped result with identical inputs was reused (no engine call).
+    reused: bool = False
 
 
 def _load_yaml(p: Path) -> Any:
@@ -38,6 +57,34 @@ def _load_manifest_engine(review_dir: Path) -> tuple[str | None, str | None, int
         return None, None, None
 
 
+def _input_stamp(review_dir: Path, **params: Any) -> Dict[str, Any]:
+    files = {}
+    for name, rel in SEMANTIC_INPUT_FILES.items():
+        p = review_dir / rel
+        files[name] = sha256_file(p) if p.is_file() else None
+    return {"prompt_version": SEMANTIC_PROMPT_VERSION, **params, "sha256": files}
+
+
+def _issues(out: Any, errors: List[str], warnings: List[str]) -> None:
+    data = out.get("data") if isinstance(out, dict) else None
+    if isinstance(data, dict):
+        issues = data.get("issues", [])
+        for it in issues if isinstance(issues, list) else []:
+            if not isinstance(it, dict):
+                continue
+            sev = it.get("severity", "warning")
+            msg = it.get("message", "")
+            code = it.get("code", "")
+            artifact = it.get("artifact", "unknown")
+            line = f"semantic:{sev}:{code}:{artifact}: {msg}".strip()
+            if sev == "error":
+                errors.append(line)
+            else:
+                warnings.append(line)
+    else:
+        warnings.append("semantic:warning:unstructured:unknown: Semantic validator returned no 'data' object")
+
+
 def semantic_validate(
     *,
     review_dir: Path,
@@ -45,11 +92,18 @@ def semantic_validate(
     model: str | None,
     max_input_chars: int = 180_000,
     max_input_tokens: int | None = None,
+    force: bool = False,
 ) -> SemanticValidation:
     """Run optional semantic validation using the selected engine.
 
     This is *not* required for offline determinism. It is an opt-in tier.
-    The result is persisted to run/semantic-validation.json.
+    Local engines run the deterministic evidence-grounding check (quotes and
+    scorecard cues matched against the extracted pages; see
+    dpi_lab.core.grounding) instead of a model call.
+    The result is persisted to run/semantic-validation.json, stamped with the
+    hashes of its inputs (paper text, artifacts, engine, model, prompt
+    version). A stamped result whose inputs are unchanged is reused without
+    an engine call unless force is set.
     """
 
     review_dir = review_dir.resolve()
@@ -62,11 +116,27 @@ def semantic_validate(
         errors.append("No engine specified for semantic validation and no manifest engine found.")
         return SemanticValidation(errors=errors, warnings=warnings)
 
-    if chosen_engine == "local":
-        errors.append("Semantic validation requires a model-backed engine; 'local' does not support it.")
-        return SemanticValidation(errors=errors, warnings=warnings)
+    # Local engines run the offline evidence-grounding check; no model involved.
+    local = chosen_engine in LOCAL_ENGINES
+    chosen_model = None if local else (model or manifest_model or "gpt-5")
 
-    chosen_model = model or manifest_model or "gpt-5"
+    out_path = review_dir / "run" / "semantic-validation.json"
+    stamp = _input_stamp(
+        review_dir,
+        engine=chosen_engine,
+        model=chosen_model,
+        max_input_chars=max_input_chars,
+        max_input_tokens=max_input_tokens,
+        **({"grounding_version": GROUNDING_VERSION} if local else {}),
+    )
+    if not force and out_path.exists():
+        try:
+            previous = json.loads(out_path.read_text(encoding="utf-8"))
+        except Exception:
+            previous = None
+        if isinstance(previous, dict) and previous.get("inputs") == stamp:
+            _issues(previous, errors, warnings)
+            return SemanticValidation(errors=errors, warnings=warnings, output_path=out_path, reused=True)
 
     # Load paper text
     extracted = review_dir / "extracted" / "paper.text.v1.txt"
@@ -115,6 +185,7 @@ def semantic_validate(
         seed=seed,
         max_input_chars=max_input_chars,
         max_input_tokens=max_input_tokens,
+        token_counts_path=str(review_dir / "extracted" / "paper.tokens.v1.json"),
     )
 
     eng = get_engine(chosen_engine)
@@ -125,27 +196,8 @@ def semantic_validate(
         return SemanticValidation(errors=errors, warnings=warnings)
 
     # Persist
-    run_dir = review_dir / "run"
-    run_dir.mkdir(parents=True, exist_ok=True)
-    out_path = run_dir / "semantic-validation.json"
+    out = {"inputs": stamp, **out} if isinstance(out, dict) else out
     safe_write_text(out_path, json.dumps(out, indent=2, ensure_ascii=False) + "\n")
 
-    data = out.get("data") if isinstance(out, dict) else None
-    if isinstance(data, dict):
-        issues = data.get("issues", [])
-        for it in issues if isinstance(issues, list) else []:
-            if not isinstance(it, dict):
-                continue
-            sev = it.get("severity", "warning")
-            msg = it.get("message", "")
-            code = it.get("code", "")
-            artifact = it.get("artifact", "unknown")
-            line = f"semantic:{sev}:{code}:{artifact}: {msg}".strip()
-            if sev == "error":
-                errors.append(line)
-            else:
-                warnings.append(line)
-    else:
-        warnings.append("semantic:warning:unstructured:unknown: Semantic validator returned no 'data' object")
-
+    _issues(out, errors, warnings)
     return SemanticValidation(errors=errors, warnings=warnings, output_path=out_path)
@@ -0,0 +1,146 @@
+from __future__ import annotations
+
+"""Corpus score analytics over the SQLite index (dpi-lab stats).
+
+Scores are loaded once from the index into a papers x dimensions float
+array (NaN for a missing score); distributions, percentiles, correlations
+and per-group means are then a handful of vectorized NumPy passes, so the
+cost is dominated by the single SELECT rather than by per-file YAML parsing.
+
+NumPy is optional: install it (or the `stats` extra) to use this module.
+"""
+
+import warnings
+from pathlib import Path
+from typing import Any, Dict, List, Sequence
+
+from dpi_lab.core.index import SCORE_DIMENSIONS, query_index
+
+SCORE_MIN = 0
+SCORE_MAX = 5
+DEFAULT_PERCENTILES = (10, 25, 50, 75, 90)
+STATS_GROUP_FIELDS = ("batch", "year", "published_year", "engine", "model", "source")
+
+
+def _numpy() -> Any:
+    try:
+        import numpy as np  # type: ignore
+    except Exception as e:
+        raise RuntimeError(
+            "Missing dependency 'numpy'. Install it (pip install 'dpi-ai-governance-lab[stats]') to use dpi-lab stats."
+        ) from e
+    return np
+
+
+def _num(x: Any) -> Any:
+    """JSON-safe float: NaN becomes None, values are rounded to 4 places."""
+    x = float(x)
+    return None if x != x else round(x, 4)
+
+
+def corpus_stats(
+    db_path: Path,
+    *,
+    by: str = "batch",
+    percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+) -> Dict[str, Any]:
+    """Per-dimension distributions, correlations and per-group means.
+
+    Correlations are Pearson over papers that have all five scores; a
+    dimension with no variance correlates as None.
+    """
+    if by not in STATS_GROUP_FIELDS:
+        raise ValueError(f"Invalid group field {by!r}: expected one of {', '.join(STATS_GROUP_FIELDS)}")
+    np = _numpy()
+
+    dims = list(SCORE_DIMENSIONS)
+    qr = query_index(db_path, sql=f"SELECT {by}, {', '.join(dims)} FROM reviews ORDER BY review_dir")
+    n, d = len(qr.rows), len(dims)
+    out: Dict[str, Any] = {"papers": n, "dimensions": dims}
+    if n == 0:
+        return out
+
+    keys = np.array(["(none)" if r[0] is None else str(r[0]) for r in qr.rows], dtype=str)
+    x = np.array([r[1:] for r in qr.rows], dtype=float)
+    valid = ~np.isnan(x)
+    x0 = np.where(valid, x, 0.0)
+
+    with warnings.catch_warnings():
+        # All-missing columns produce NaN (reported as None), not warnings.
+        warnings.simplefilter("ignore", RuntimeWarning)
+        count = valid.sum(axis=0)
+        mean = np.nanmean(x, axis=0)
+        std = np.nanstd(x, axis=0)
+        lo = np.nanmin(x, axis=0)
+        hi = np.nanmax(x, axis=0)
+        pct = np.nanpercentile(x, list(percentiles), axis=0)
+
+        # Histogram of integer scores for every dimension in one bincount.
+        width = SCORE_MAX - SCORE_MIN + 1
+        in_range = valid & (x0 >= SCORE_MIN) & (x0 <= SCORE_MAX) & (x0 == np.floor(x0))
+        cells = (np.arange(d) * width + (x0 - SCORE_MIN).astype(int))[in_range]
+        hist = np.bincount(cells, minlength=d * width).reshape(d, width)
+
+        complete = valid.all(axis=1)
+        corr = np.corrcoef(x[complete], rowvar=False) if complete.sum() > 1 else np.full((d, d), np.nan)
+
+        # Per-group sums and counts for all dimensions in two bincounts.
+        groups, inv = np.unique(keys, return_inverse=True)
+        g = len(groups)
+        flat = (inv[:, None] * d + np.arange(d)).ravel()
+        sums = np.bincount(flat, weights=x0.ravel(), minlength=g * d).reshape(g, d)
+        counts = np.bincount(flat, weights=valid.ravel(), minlength=g * d).reshape(g, d)
+        papers = np.bincount(inv, minlength=g)
+        group_mean = sums / counts
+
+    out["distribution"] = {
+        dim: {
+            "count": int(count[j]),
+            "mean": _num(mean[j]),
+            "std": _num(std[j]),
+            "min": _num(lo[j]),
+            "max": _num(hi[j]),
+            "percentiles": {f"p{q:g}": _num(pct[i, j]) for i, q in enumerate(percentiles)},
+            "histogram": {str(SCORE_MIN + k): int(hist[j, k]) for k in range(width)},
+        }
+        for j, dim in enumerate(dims)
+    }
+    out["correlation"] = {
+        "method": "pearson",
+        "papers": int(complete.sum()),
+        "matrix": {a: {b: _num(corr[i, j]) for j, b in enumerate(dims)} for i, a in enumerate(dims)},
+    }
+    out["groups"] = {
+        "by": by,
+        "rows": [
+            {
+                "group": str(groups[k]),
+                "papers": int(papers[k]),
+                "mean": {dim: _num(group_mean[k, j]) for j, dim in enumerate(dims)},
+                "delta": {dim: _num(group_mean[k, j] - mean[j]) for j, dim in enumerate(dims)},
+            }
+            for k in range(g)
+        ],
+    }
+    return out
+
+
+def stats_rows(stats: Dict[str, Any]) -> List[List[Any]]:
+    """Flatten corpus_stats output into (section, group, dimension, metric, value) rows for CSV."""
+    rows: List[List[Any]] = [["corpus", "", "", "papers", stats["papers"]]]
+    for dim, dist in (stats.get("distribution") or {}).items():
+        for metric in ("count", "mean", "std", "min", "max"):
+            rows.append(["distribution", "", dim, metric, dist[metric]])
+        for name, value in dist["percentiles"].items():
+            rows.append(["distribution", "", dim, name, value])
+        for score, value in dist["histogram"].items():
+            rows.append(["histogram", "", dim, score, value])
+    for a, row in ((stats.get("correlation") or {}).get("matrix") or {}).items():
+        for b, value in row.items():
+            rows.append(["correlation", a, b, "pearson", value])
+    for grp in (stats.get("groups") or {}).get("rows") or []:
+        rows.append(["group", grp["group"], "", "papers", grp["papers"]])
+        for dim in grp["mean"]:
+            rows.append(["group", grp["group"], dim, "mean", grp["mean"][dim]])
+            rows.append(["group", grp["group"], dim, "delta", grp["delta"][dim]])
+    return rows
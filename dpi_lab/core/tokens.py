@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+"""Token budgeting helpers.
+
+Engines pass a tokenizer encoding (tiktoken-compatible: encode/decode_bytes)
+when available; otherwise the ~4 chars/token heuristic used throughout the
+workbench applies.
+"""
+
+import json
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+from dpi_lab.core.utils import safe_write_text, sha256_bytes
+
+CHARS_PER_TOKEN = 4
+TOKEN_COUNTS_VERSION = 1
+
+
+def clip_to_token_budget(text: str, max_tokens: int, *, encoding: Optional[Any] = None) -> str:
+    """Return the longest prefix of text that fits in max_tokens (deterministic).
+
+    With an encoding, only a window of the text is encoded (grown until it
+    holds more than max_tokens tokens, or covers the text); the first
+    max_tokens ids are mapped back to a character offset since token bytes
+    are a prefix of the UTF-8 text. A verification encode guards against BPE
+    merges that differ at the cut, shrinking by the overshoot if needed.
+    """
+    if max_tokens <= 0:
+        raise ValueError("max_tokens must be > 0")
+    if encoding is None:
+        return text[: max_tokens * CHARS_PER_TOKEN]
+
+    window = max_tokens * CHARS_PER_TOKEN * 2
+    while True:
+        clipped = text[:window]
+        ids = encoding.encode(clipped)
+        if len(ids) > max_tokens or window >= len(text):
+            break
+        window *= 2
+
+    budget = max_tokens
+    while len(ids) > max_tokens:
+        prefix = encoding.decode_bytes(ids[:budget]).decode("utf-8", errors="ignore")
+        clipped = clipped[: len(prefix)]
+        ids = encoding.encode(clipped)
+        budget -= max(1, len(ids) - max_tokens)
+    return clipped
+
+
+class TokenCounter:
+    """Memoized token counter keyed on the sha256 of the counted text.
+
+    Counts are per encoding; with a path (extracted/paper.tokens.v1.json) they
+    persist across runs so chunking, budgeting and clipping of the same paper
+    tokenize each page once. Without an encoding the heuristic is used and
+    nothing is persisted.
+    """
+
+    def __init__(self, encoding: Optional[Any], *, encoding_name: str = "", path: Optional[Path] = None) -> None:
+        self.encoding = encoding
+        self.encoding_name = encoding_name or str(getattr(encoding, "name", ""))
+        self.path = path
+        self.hits = 0
+        self.misses = 0
+        self._counts: Dict[str, int] = {}
+        self._stored: Dict[str, Dict[str, int]] = {}
+        self._dirty = False
+        self._lock = threading.Lock()
+        if encoding is not None and path is not None and path.exists():
+            try:
+                data = json.loads(path.read_text(encoding="utf-8"))
+                if data.get("version") == TOKEN_COUNTS_VERSION:
+                    self._stored = {k: dict(v) for k, v in data.get("encodings", {}).items()}
+            except Exception:
+                self._stored = {}
+            self._counts = dict(self._stored.get(self.encoding_name, {}))
+
+    def count(self, text: str) -> int:
+        if self.encoding is None:
+            # Rough heuristic: ~4 chars per token for English-ish text.
+            return max(1, len(text) // CHARS_PER_TOKEN)
+        key = sha256_bytes(text.encode("utf-8"))
+        with self._lock:
+            n = self._counts.get(key)
+            if n is not None:
+                self.hits += 1
+                return n
+        n = len(self.encoding.encode(text))
+        with self._lock:
+            self.misses += 1
+            if self._counts.get(key) != n:
+                self._counts[key] = n
+                self._dirty = True
+        return n
+
+    def save(self) -> None:
+        """Persist counts (no-op without a path/encoding or when unchanged)."""
+        if self.encoding is None or self.path is None or not self._dirty:
+            return
+        with self._lock:
+            stored = dict(self._stored)
+            stored[self.encoding_name] = dict(sorted(self._counts.items()))
+            payload = {"version": TOKEN_COUNTS_VERSION, "encodings": dict(sorted(stored.items()))}
+            safe_write_text(self.path, json.dumps(payload, indent=2) + "\n")
+            self._stored = stored
+            self._dirty = False
+
+    def stats(self) -> Dict[str, Any]:
+        return {"encoding": self.encoding_name or None, "hits": self.hits, "misses": self.misses}
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
 import hashlib
+import os
+import uuid
 from pathlib import Path
 
 
@@ -19,5 +21,59 @@ def sha256_file(path: Path) -> str:
 
 
 def safe_write_text(path: Path, text: str) -> None:
+    # Write to a sibling temp file and rename so readers (and concurrent
+    # writers) never observe a partially written file.
     path.parent.mkdir(parents=True, exist_ok=True)
-    path.write_text(text, encoding='utf-8', newline='\n')
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        tmp.write_text(text, encoding='utf-8', newline='\n')
+        os.replace(tmp, path)
+    finally:
+        if tmp.exists():
+            tmp.unlink()
+
+
+class StreamingTextWriter:
+    """Write UTF-8 text to path incrementally while hashing it.
+
+    Like safe_write_text, the file appears atomically when the context exits
+    cleanly; on error the partial temp file is removed.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+        self._h = hashlib.sha256()
+        self._f = None
+
+    def __enter__(self) -> "StreamingTextWriter":
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._f = self._tmp.open('wb')
+        return self
+
+    def write(self, s: str) -> None:
+        b = s.encode('utf-8')
+        self._f.write(b)
+        self._h.update(b)
+
+    def hexdigest(self) -> str:
+        return self._h.hexdigest()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self._f.close()
+        if exc_type is None:
+            os.replace(self._tmp, self.path)
+        elif self._tmp.exists():
+            self._tmp.unlink()
+
+
+def default_cache_dir() -> Path:
+    """Root directory for workbench caches.
+
+    DPI_LAB_CACHE_DIR wins; otherwise $XDG_CACHE_HOME/dpi-lab (~/.cache/dpi-lab).
+    """
+    env = os.getenv("DPI_LAB_CACHE_DIR")
+    if env:
+        return Path(env).expanduser().resolve()
+    base = os.getenv("XDG_CACHE_HOME") or "~/.cache"
+    return (Path(base).expanduser() / "dpi-lab").resolve()
@@ -1,14 +1,31 @@
 from __future__ import annotations
 
 import json
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any, Dict, List
-
-import yaml
-from jsonschema import Draft202012Validator
-
-from dpi_lab.core.schemas import load_schema
+from typing import Any, Dict, List, Optional
+
+from dpi_lab import __version__
+from dpi_lab.core.cache import cache_key
+from dpi_lab.core.schemas import load_schema, load_validator, schema_sha256
+from dpi_lab.core.utils import safe_write_text, sha256_file
+
+CONTRACT_FILES = [
+    "paper-analysis.md",
+    "paper-review-report.md",
+    "paper-review-metadata.yaml",
+    "paper-review-scorecard.yaml",
+]
+RUN_ARTIFACTS = [
+    "paper.pdf",
+    "extracted/paper.text.v1.txt",
+    "run/manifest.json",
+]
+VALIDATION_SCHEMAS = [
+    "schemas/reviews/paper-review-metadata.schema.json",
+    "schemas/reviews/paper-review-scorecard.schema.json",
+]
+VALIDATION_CACHE_VERSION = 1
 
 
 @dataclass
@@ -16,6 +33,9 @@ class ValidationResult:
     ok: bool
     errors: List[str]
     warnings: List[str]
+    # Review directories validated in this run vs. answered from the result cache.
+    checked: List[str] = field(default_factory=list)
+    cached: List[str] = field(default_factory=list)
 
 
 
@@ -24,11 +44,12 @@ def _load_json(p: Path) -> Any:
 
 
 def _load_yaml(p: Path) -> Any:
+    import yaml
+
     return yaml.safe_load(p.read_text(encoding="utf-8"))
 
 
-def _validate_schema(instance: Any, schema: Dict[str, Any], label: str) -> list[str]:
-    v = Draft202012Validator(schema)
+def _validate_schema(instance: Any, v: Any, label: str) -> list[str]:
     out: List[str] = []
     for e in sorted(v.iter_errors(instance), key=lambda x: list(x.path)):
         path = "/".join([str(x) for x in e.path])
@@ -44,6 +65,7 @@ def validate_review_dir(
     model: str | None = None,
     max_input_chars: int = 180_000,
     max_input_tokens: int | None = None,
+    semantic_force: bool = False,
 ) -> ValidationResult:
     """Validate a single review directory.
 
@@ -62,47 +84,38 @@ def validate_review_dir(
     level = (level or "schema").strip().lower()
 
     # Contract artifacts (MUST)
-    contract = [
-        "paper-analysis.md",
-        "paper-review-report.md",
-        "paper-review-metadata.yaml",
-        "paper-review-scorecard.yaml",
-    ]
-    for rel in contract:
+    for rel in CONTRACT_FILES:
         if not (review_dir / rel).exists():
             errors.append(f"Missing required artifact: {rel}")
 
     # Deterministic run artifacts (SHOULD)
-    should_have = [
-        "paper.pdf",
-        "extracted/paper.text.v1.txt",
-        "run/manifest.json",
-    ]
-    for rel in should_have:
+    for rel in RUN_ARTIFACTS:
         if not (review_dir / rel).exists():
             warnings.append(f"Missing recommended deterministic run artifact: {rel}")
 
     if level in {"contract"}:
         return ValidationResult(ok=(len(errors) == 0), errors=errors, warnings=warnings)
 
+    # jsonschema is imported here so cached `dpi-lab validate` runs never load it.
+    from jsonschema import Draft202012Validator
+
     # Load schemas (from packaged resources in pip installs; fallback to repo paths in editable installs)
-    meta_schema = load_schema("schemas/reviews/paper-review-metadata.schema.json")
-    score_schema = load_schema("schemas/reviews/paper-review-scorecard.schema.json")
+    # Compiled validators are cached per process (see dpi_lab.core.schemas).
+    meta_validator = load_validator(VALIDATION_SCHEMAS[0], cls=Draft202012Validator)
+    score_validator = load_validator(VALIDATION_SCHEMAS[1], cls=Draft202012Validator)
 
     # Schema checks
     meta_p = review_dir / "paper-review-metadata.yaml"
     if meta_p.exists():
-        schema = meta_schema
         inst = _load_yaml(meta_p)
-        errors.extend(_validate_schema(inst, schema, "metadata"))
+        errors.extend(_validate_schema(inst, meta_validator, "metadata"))
     else:
         warnings.append("Metadata missing; skipping schema validation")
 
     score_p = review_dir / "paper-review-scorecard.yaml"
     if score_p.exists():
-        schema = score_schema
         inst = _load_yaml(score_p)
-        errors.extend(_validate_schema(inst, schema, "scorecard"))
+        errors.extend(_validate_schema(inst, score_validator, "scorecard"))
     else:
         warnings.append("Scorecard missing; skipping schema validation")
 
@@ -146,6 +159,7 @@ def validate_review_dir(
             model=model,
             max_input_chars=max_input_chars,
             max_input_tokens=max_input_tokens,
+            force=semantic_force,
         )
         warnings.extend(sem.warnings)
         errors.extend(sem.errors)
@@ -155,6 +169,44 @@ def validate_review_dir(
     return ValidationResult(ok=(len(errors) == 0), errors=errors, warnings=warnings)
 
 
+def _validate_one(job: Dict[str, Any]) -> ValidationResult:
+    # Module-level so it can run in a worker process.
+    return validate_review_dir(Path(job.pop("review_dir")), **job)
+
+
+def _validation_key(review_dir: Path, level: str) -> str:
+    """Hash of everything an offline validation result depends on."""
+    files: Dict[str, Optional[str]] = {}
+    for rel in CONTRACT_FILES + ["run/manifest.json"]:
+        p = review_dir / rel
+        files[rel] = sha256_file(p) if p.is_file() else None
+    return cache_key(
+        {
+            "version": VALIDATION_CACHE_VERSION,
+            "workbench_version": __version__,
+            "level": level,
+            "schemas": {rel: schema_sha256(load_schema(rel)) for rel in VALIDATION_SCHEMAS},
+            "files": files,
+            "present": {rel: (review_dir / rel).exists() for rel in RUN_ARTIFACTS},
+        }
+    )
+
+
+def _load_validation_cache(path: Path) -> Dict[str, Any]:
+    try:
+        data = json.loads(path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(data, dict) or data.get("version") != VALIDATION_CACHE_VERSION:
+        return {}
+    return data.get("entries") or {}
+
+
+def _save_validation_cache(path: Path, entries: Dict[str, Any]) -> None:
+    payload = {"version": VALIDATION_CACHE_VERSION, "entries": dict(sorted(entries.items()))}
+    safe_write_text(path, json.dumps(payload, indent=2, ensure_ascii=False) + "\n")
+
+
 def validate_tree(
     root: Path,
     *,
@@ -163,44 +215,83 @@ def validate_tree(
     model: str | None = None,
     max_input_chars: int = 180_000,
     max_input_tokens: int | None = None,
+    jobs: int = 1,
+    cache_path: Path | None = None,
+    semantic_force: bool = False,
 ) -> ValidationResult:
     """Validate a review directory or a tree of review directories.
 
     If root looks like a single review directory (contains a scorecard or metadata),
     validate it. Otherwise, recursively validate each subdirectory that contains a
     scorecard file, aggregating results.
+
+    jobs > 1 validates directories in parallel: a process pool for the offline
+    levels, a thread pool for the semantic level (model calls). Results are
+    merged in directory path order regardless of scheduling.
+
+    With cache_path (e.g. .dpi-lab-cache/validation.json), offline results are
+    keyed on the level, workbench version, schema hashes and review file hashes;
+    unchanged directories reuse their cached result.
     """
     root = root.resolve()
+    params: Dict[str, Any] = {
+        "level": level,
+        "semantic_engine": semantic_engine,
+        "model": model,
+        "max_input_chars": max_input_chars,
+        "max_input_tokens": max_input_tokens,
+        "semantic_force": semantic_force,
+    }
     marker_files = ["paper-review-scorecard.yaml", "paper-review-metadata.yaml"]
-    if any((root / m).exists() for m in marker_files):
-        return validate_review_dir(
-            root,
-            level=level,
-            semantic_engine=semantic_engine,
-            model=model,
-            max_input_chars=max_input_chars,
-            max_input_tokens=max_input_tokens,
-        )
+    single = any((root / m).exists() for m in marker_files)
+    review_dirs = [root] if single else sorted(p.parent for p in root.rglob("paper-review-scorecard.yaml"))
+
+    norm_level = (level or "schema").strip().lower()
+    use_cache = cache_path is not None and norm_level in {"contract", "schema", "policy"}
+    entries = _load_validation_cache(cache_path) if use_cache and cache_path is not None else {}
+
+    results: Dict[Path, ValidationResult] = {}
+    keys: Dict[Path, str] = {}
+    if use_cache:
+        for d in review_dirs:
+            keys[d] = _validation_key(d, norm_level)
+            hit = entries.get(str(d))
+            if hit and hit.get("key") == keys[d]:
+                results[d] = ValidationResult(**hit["result"])
+    todo = [d for d in review_dirs if d not in results]
+    job_list = [{"review_dir": str(d), **params} for d in todo]
+
+    workers = max(1, min(jobs, len(job_list)))
+    if workers == 1:
+        fresh = [_validate_one(job) for job in job_list]
+    else:
+        from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+        pool: Executor = ThreadPoolExecutor(workers) if norm_level == "semantic" else ProcessPoolExecutor(workers)
+        with pool:
+            fresh = list(pool.map(_validate_one, job_list))
+    results.update(zip(todo, fresh))
+
+    if use_cache and todo and cache_path is not None:
+        for d, res in zip(todo, fresh):
+            entries[str(d)] = {"key": keys[d], "result": {"ok": res.ok, "errors": res.errors, "warnings": res.warnings}}
+        _save_validation_cache(cache_path, entries)
+
+    checked = [str(d) for d in todo]
+    cached = [str(d) for d in review_dirs if str(d) not in checked]
+    if single:
+        res = results[root]
+        return ValidationResult(ok=res.ok, errors=res.errors, warnings=res.warnings, checked=checked, cached=cached)
 
     errors: List[str] = []
     warnings: List[str] = []
-    found = 0
-    for p in root.rglob("paper-review-scorecard.yaml"):
-        review_dir = p.parent
-        found += 1
-        res = validate_review_dir(
-            review_dir,
-            level=level,
-            semantic_engine=semantic_engine,
-            model=model,
-            max_input_chars=max_input_chars,
-            max_input_tokens=max_input_tokens,
-        )
+    for review_dir in review_dirs:
+        res = results[review_dir]
         if not res.ok:
             errors.append(f"{review_dir}: " + "; ".join(res.errors))
         warnings.extend([f"{review_dir}: {w}" for w in res.warnings])
 
-    if found == 0:
+    if not review_dirs:
         errors.append(f"No review directories found under: {root}")
 
-    return ValidationResult(ok=len(errors) == 0, errors=errors, warnings=warnings)
+    return ValidationResult(ok=len(errors) == 0, errors=errors, warnings=warnings, checked=checked, cached=cached)
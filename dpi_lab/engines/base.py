@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Any, Dict, Optional
 
 
@@ -29,10 +29,25 @@ class EngineConfig:
     # If the canonicalized paper text exceeds max_input_chars, engines SHOULD
     # switch to deterministic chunking and multi-pass summarization.
     chunk_max_chars: int = 60_000
+    # Digests per reduce prompt: more chunks are merged hierarchically in
+    # groups of reduce_fan_in until at most chunk_max_count remain.
     chunk_max_count: int = 12
+    reduce_fan_in: int = 4
+    # "greedy" fills chunks up to the budget; "balanced" spreads all pages
+    # evenly over at most chunk_max_count chunks (no merge levels).
+    chunk_strategy: str = "greedy"
+    # Upper bound on in-flight model calls, shared by the chunk map pass and
+    # the reduce-phase artifact calls. Results keep a deterministic order.
+    map_concurrency: int = 4
     # Where applicable; engines may ignore unsupported params.
     temperature: float = 0.0
     top_p: float = 1.0
+    # On-disk response cache (model-backed engines). None disables caching.
+    cache_dir: Optional[str] = None
+    cache_max_bytes: int = 512 * 1024 * 1024
+    # Persisted per-text token counts (extracted/paper.tokens.v1.json). None
+    # keeps counts in memory for the run only.
+    token_counts_path: Optional[str] = None
 
 
 @dataclass(frozen=True)
@@ -45,6 +60,8 @@ class EngineResult:
     report: Dict[str, Any]
     # Raw response payloads for audit/debug.
     raw: Dict[str, Any]
+    # Run statistics (e.g. cache hits) that are not part of the raw payload.
+    stats: Dict[str, Any] = field(default_factory=dict)
 
 
 class ReviewEngine:
@@ -57,7 +74,15 @@ class ReviewEngine:
         pdf_sha256: str,
         config: EngineConfig,
         pages: Optional[list[Dict[str, Any]]] = None,
+        prior_digests: Optional[list[Dict[str, Any]]] = None,
     ) -> EngineResult:
+        """Generate review artifacts.
+
+        prior_digests are chunk digests from a previous review of the same
+        paper ({"chunk_id", "start_page", "end_page", "sha256", "digest"});
+        engines that chunk MAY reuse them for unchanged chunks.
+        """
+
         raise NotImplementedError
 
     def semantic_validate(
@@ -2,14 +2,43 @@ from __future__ import annotations
 
 import json
 import os
+import threading
 import time
-from typing import Any, Dict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+from dpi_lab.core.cache import ResponseCache, cache_key
+from dpi_lab.core.chunking import ChunkPlanner
+from dpi_lab.core.schemas import load_schema, validate_instance
+from dpi_lab.core.tokens import TokenCounter, clip_to_token_budget
+from dpi_lab.core.utils import sha256_bytes
+from dpi_lab.engines.base import EngineConfig, EngineResult, ReviewEngine
 
-from jsonschema import validate as js_validate
 
-from dpi_lab.core.chunking import make_chunks
-from dpi_lab.core.schemas import load_schema
-from dpi_lab.engines.base import EngineConfig, EngineResult, ReviewEngine
+def output_text_from_dump(obj: Any) -> str:
+    """Extract output text from a dumped (JSON) Responses payload.
+
+    Used for live payloads without the SDK convenience accessor and for
+    replaying persisted raw responses.
+    """
+
+    def walk(x: Any) -> list[str]:
+        found: list[str] = []
+        if isinstance(x, dict):
+            # Typical Responses structure: output -> content -> {type: output_text, text: ...}
+            if x.get("type") in {"output_text", "text"} and isinstance(x.get("text"), str):
+                found.append(x["text"])
+            for v in x.values():
+                found.extend(walk(v))
+        elif isinstance(x, list):
+            for it in x:
+                found.extend(walk(it))
+        return found
+
+    texts = walk(obj)
+    joined = "\n".join(t for t in texts if t.strip())
+    return joined if joined.strip() else ""
 
 
 class OpenAIEngine(ReviewEngine):
@@ -47,8 +76,12 @@ class OpenAIEngine(ReviewEngine):
         else:
             self.client = OpenAI(api_key=api_key)
 
-        # Optional tokenizer for token-aware chunking and budgets.
-        self._tokenizer = None
+        self._cache: ResponseCache | None = None
+        self._cache_lock = threading.Lock()
+
+        # Optional tokenizer for token-aware chunking and budgets; encodings
+        # are resolved once per model and held for the engine's lifetime.
+        self._encodings: Dict[str, Any] = {}
         try:  # pragma: no cover
             import tiktoken  # type: ignore
 
@@ -56,22 +89,30 @@ class OpenAIEngine(ReviewEngine):
         except Exception:  # pragma: no cover
             self._tiktoken = None
 
-    def _count_tokens(self, text: str, model: str) -> int:
+    def _encoding(self, model: str) -> Any:
+        """Return the tiktoken encoding for model, or None without tiktoken."""
+
+        if self._tiktoken is None:
+            return None
+        enc = self._encodings.get(model)
+        if enc is None:
+            try:
+                enc = self._tiktoken.encoding_for_model(model)
+            except Exception:
+                enc = self._tiktoken.get_encoding("o200k_base")
+            self._encodings[model] = enc
+        return enc
+
+    def _token_counter(self, config: EngineConfig) -> TokenCounter:
         """Best-effort token counter.
 
-        Uses tiktoken when available; otherwise falls back to a conservative
+        Uses tiktoken when available (memoized, persisted at
+        config.token_counts_path); otherwise falls back to a conservative
         character heuristic.
         """
 
-        if self._tiktoken is None:
-            # Rough heuristic: ~4 chars per token for English-ish text.
-            return max(1, len(text) // 4)
-
-        try:
-            enc = self._tiktoken.encoding_for_model(model)
-        except Exception:
-            enc = self._tiktoken.get_encoding("o200k_base")
-        return len(enc.encode(text))
+        path = Path(config.token_counts_path) if config.token_counts_path else None
+        return TokenCounter(self._encoding(config.model), path=path)
 
     def _extract_output_text(self, payload: Any) -> str:
         """Extract output text from an OpenAI Responses payload robustly."""
@@ -98,29 +139,50 @@ class OpenAIEngine(ReviewEngine):
         else:
             obj = None
 
-        def walk(x: Any) -> list[str]:
-            found: list[str] = []
-            if isinstance(x, dict):
-                # Typical Responses structure: output -> content -> {type: output_text, text: ...}
-                if x.get("type") in {"output_text", "text"} and isinstance(x.get("text"), str):
-                    found.append(x["text"])
-                for v in x.values():
-                    found.extend(walk(v))
-            elif isinstance(x, list):
-                for it in x:
-                    found.extend(walk(it))
-            return found
-
         if obj is not None:
-            texts = walk(obj)
-            joined = "\n".join(t for t in texts if t.strip())
-            if joined.strip():
-                return joined
+            return output_text_from_dump(obj)
 
         return ""
 
+    def _response_cache(self, config: EngineConfig) -> ResponseCache | None:
+        if config.cache_dir is None:
+            return None
+        with self._cache_lock:
+            if self._cache is None or str(self._cache.root) != config.cache_dir:
+                self._cache = ResponseCache(Path(config.cache_dir), max_bytes=config.cache_max_bytes)
+            return self._cache
+
+    def _cache_stats(self, config: EngineConfig) -> Dict[str, Any]:
+        cache = self._response_cache(config)
+        if cache is None:
+            return {"response_cache": {"enabled": False}}
+        return {"response_cache": {"enabled": True, **cache.stats()}}
+
     def _call(self, *, prompt: str, schema_name: str, schema: Dict[str, Any], config: EngineConfig) -> Dict[str, Any]:
-        """Deterministic schema-constrained call with bounded repair retries."""
+        """Deterministic schema-constrained call with bounded repair retries.
+
+        Successful results are served from / stored in the response cache when
+        config.cache_dir is set. The key covers everything that shapes the request.
+        """
+
+        cache = self._response_cache(config)
+        key = None
+        if cache is not None:
+            key = cache_key(
+                {
+                    "model": config.model,
+                    "schema_name": schema_name,
+                    "schema_sha256": cache_key(schema),
+                    "prompt_sha256": sha256_bytes(prompt.encode("utf-8")),
+                    "seed": config.seed,
+                    "temperature": config.temperature,
+                    "top_p": config.top_p,
+                    "max_output_tokens": config.max_output_tokens,
+                }
+            )
+            hit = cache.get(key)
+            if hit is not None:
+                return hit
 
         response_format = {
             "type": "json_schema",
@@ -162,23 +224,115 @@ class OpenAIEngine(ReviewEngine):
                 if not out.strip():
                     raise ValueError("Empty output_text")
                 data = json.loads(out)
-                js_validate(instance=data, schema=schema)
-                return {"data": data, "raw": getattr(payload, "model_dump", lambda: payload)()}
+                validate_instance(data, schema)
+                result = {"data": data, "raw": getattr(payload, "model_dump", lambda: payload)()}
             except Exception as e:
                 last_err = str(e)
                 # Small backoff to avoid provider throttling on repair.
                 time.sleep(0.2)
                 continue
+            if cache is not None and key is not None:
+                cache.put(key, result)
+            return result
 
         # If we get here, all attempts failed.
         raise RuntimeError(f"OpenAI structured call failed for {schema_name}: {last_err}")
 
-    def generate(self, *, text: str, pdf_sha256: str, config: EngineConfig, pages=None) -> EngineResult:
+    def _call_many(self, calls: List[Dict[str, Any]], config: EngineConfig) -> List[Dict[str, Any]]:
+        """Run independent ``_call``s with bounded concurrency.
+
+        Results are returned in input order regardless of completion order, so
+        downstream artifacts are identical to a sequential run.
+        """
+
+        workers = max(1, min(config.map_concurrency, len(calls)))
+        if workers == 1:
+            return [self._call(config=config, **c) for c in calls]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(self._call, config=config, **c) for c in calls]
+            try:
+                for f in as_completed(futures):
+                    f.result()
+            except BaseException:
+                # Fail fast: drop queued (paid) calls instead of waiting them out.
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+            return [f.result() for f in futures]
+
+    def _call_tree(
+        self,
+        leaves: List[Dict[str, Any]],
+        *,
+        fan_in: int,
+        levels: int,
+        merge: Callable[[int, int, List[Dict[str, Any]]], Dict[str, Any]],
+        config: EngineConfig,
+        resolved: Dict[int, Dict[str, Any]] | None = None,
+    ) -> List[List[Dict[str, Any]]]:
+        """Run leaf calls plus ``levels`` rounds of fan-in merges in one bounded pool.
+
+        A merge is submitted as soon as all of its children have finished, so
+        levels overlap instead of waiting for the previous level to complete.
+        ``merge(level, index, children)`` builds the call for that node; it runs
+        on the calling thread. Leaves in ``resolved`` (index -> result) are not
+        called. Results are returned per level in node order.
+        """
+
+        resolved = resolved or {}
+        sizes = [len(leaves)]
+        for _ in range(levels):
+            sizes.append(-(-sizes[-1] // fan_in))
+        results: List[List[Any]] = [[None] * n for n in sizes]
+        workers = max(1, min(config.map_concurrency, len(leaves)))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            pending: Dict[Any, Tuple[int, int]] = {}
+
+            def finish(level: int, i: int, result: Dict[str, Any]) -> None:
+                results[level][i] = result
+                if level == levels:
+                    return
+                group = i // fan_in
+                children = results[level][group * fan_in : (group + 1) * fan_in]
+                if all(c is not None for c in children):
+                    call = merge(level + 1, group, children)
+                    pending[pool.submit(self._call, config=config, **call)] = (level + 1, group)
+
+            for i, call in enumerate(leaves):
+                if i not in resolved:
+                    pending[pool.submit(self._call, config=config, **call)] = (0, i)
+            for i in sorted(resolved):
+                finish(0, i, resolved[i])
+            try:
+                while pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for fut in sorted(done, key=lambda f: pending[f]):
+                        level, i = pending.pop(fut)
+                        finish(level, i, fut.result())
+            except BaseException:
+                # Fail fast: drop queued (paid) calls instead of waiting them out.
+                pool.shutdown(wait=False, cancel_futures=True)
+                raise
+        return results
+
+    def generate(
+        self,
+        *,
+        text: str,
+        pdf_sha256: str,
+        config: EngineConfig,
+        pages=None,
+        prior_digests: List[Dict[str, Any]] | None = None,
+    ) -> EngineResult:
         """Generate a review using JSON-first structured outputs.
 
         For long papers, we switch to deterministic chunking + multi-pass summarization:
         - Map pass: chunk -> chunk_digest JSON
+        - Merge levels (only past chunk_max_count digests): reduce_fan_in digests -> chunk_digest JSON
         - Reduce pass: aggregate digests -> final artifacts JSON
+
+        prior_digests (from a previous review of an earlier edition) anchor
+        chunk boundaries on unchanged page ranges; digests of chunks whose
+        sha256 is unchanged are reused instead of re-requested.
         """
 
         # If pages are not provided, fall back to a single-page representation.
@@ -186,7 +340,8 @@ class OpenAIEngine(ReviewEngine):
             pages = [{"page": 1, "text": text}]
 
         # Decide strategy based on input length (token-aware when possible).
-        total_tokens = self._count_tokens(text, config.model)
+        counter = self._token_counter(config)
+        total_tokens = counter.count(text)
         use_chunking = False
         if config.max_input_tokens is not None:
             use_chunking = total_tokens > config.max_input_tokens
@@ -196,13 +351,11 @@ class OpenAIEngine(ReviewEngine):
         clipped = text
         if config.max_input_tokens is not None:
             # Token-aware clipping: keep a deterministic prefix under budget.
-            # We clip by chars first using heuristic, then shrink until within token budget.
-            target = max(1, int(config.max_input_tokens * 4))
-            clipped = text[:target]
-            while self._count_tokens(clipped, config.model) > config.max_input_tokens and len(clipped) > 1000:
-                clipped = clipped[: int(len(clipped) * 0.9)]
+            if total_tokens > config.max_input_tokens:
+                clipped = clip_to_token_budget(text, config.max_input_tokens, encoding=counter.encoding)
         else:
             clipped = text[: config.max_input_chars]
+        counter.save()
 
         # Load schemas
         meta_schema = load_schema("schemas/reviews/paper-review-metadata.schema.json")
@@ -253,6 +406,12 @@ class OpenAIEngine(ReviewEngine):
 
         chunk_digests = []
         chunk_prompts: Dict[str, str] = {}
+        planned_count = 0
+        pages_covered = 0
+        reduce_tree: List[List[Dict[str, Any]]] = []
+        reduce_digests: Dict[str, Any] = {}
+        reduce_prompts: Dict[str, str] = {}
+        reused_chunks: List[str] = []
 
         if use_chunking:
             # Deterministic page-group chunking.
@@ -260,18 +419,31 @@ class OpenAIEngine(ReviewEngine):
             token_counter = None
             max_tokens = None
             if config.chunk_max_tokens is not None:
-                token_counter = lambda s: self._count_tokens(s, config.model)
+                token_counter = counter.count
                 max_tokens = config.chunk_max_tokens
 
-            chunks = make_chunks(
-                pages=pages,
-                max_chars=config.chunk_max_chars,
-                max_count=config.chunk_max_count,
-                max_tokens=max_tokens,
-                token_counter=token_counter,
-            )
-
-            for ch in chunks:
+            planner = ChunkPlanner(pages, token_counter=token_counter)
+            prior = {d["sha256"]: d for d in prior_digests or []}
+            if prior and config.chunk_strategy != "balanced":
+                previous = [(d["start_page"], d["end_page"], sha) for sha, d in prior.items()]
+                plans = planner.plan_incremental(previous, max_chars=config.chunk_max_chars, max_tokens=max_tokens)
+            else:
+                plans = planner.plan(max_chars=config.chunk_max_chars, max_tokens=max_tokens)
+            planned_count = len(plans)
+            if config.chunk_strategy == "balanced":
+                # Same chunk count when the budget fits, otherwise the whole
+                # paper in exactly chunk_max_count (over-budget) chunks.
+                plans = planner.plan_balanced(min(planned_count, config.chunk_max_count))
+            pages_covered = plans[-1].last if plans else 0
+            counter.save()
+
+            # Chunk text is only built for the chunks that are sent.
+            tree_nodes: Dict[Tuple[int, int], Dict[str, Any]] = {}
+            resolved: Dict[int, Dict[str, Any]] = {}
+            for i, ch in enumerate(planner.iter_chunks(plans)):
+                if ch.sha256 in prior:
+                    resolved[i] = {"data": prior[ch.sha256]["digest"], "raw": None}
+                    reused_chunks.append(ch.chunk_id)
                 digest_prompt = (
                     f"{common_header}\n\n"
                     "Task: Produce a chunk_digest JSON capturing evidence-bearing points from this chunk. "
@@ -283,22 +455,90 @@ class OpenAIEngine(ReviewEngine):
                     "-----END CHUNK TEXT-----\n"
                 )
                 chunk_prompts[ch.chunk_id] = digest_prompt
-                digest = self._call(
-                    prompt=digest_prompt,
-                    schema_name="chunk_digest",
-                    schema=chunk_digest_schema,
-                    config=config,
+                tree_nodes[(0, i)] = {"chunk_id": ch.chunk_id, "pages": [ch.start_page, ch.end_page], "sha256": ch.sha256}
+
+            # Tree reduce: more than chunk_max_count digests are merged in
+            # groups of reduce_fan_in, level by level, into intermediate digests.
+            fan_in = max(2, config.reduce_fan_in)
+            levels = 0
+            width = len(chunk_prompts)
+            while width > config.chunk_max_count:
+                width = -(-width // fan_in)
+                levels += 1
+
+            def merge_call(level: int, index: int, children: List[Dict[str, Any]]) -> Dict[str, Any]:
+                below = [tree_nodes[(level - 1, index * fan_in + j)] for j in range(len(children))]
+                start_page, end_page = below[0]["pages"][0], below[-1]["pages"][1]
+                blob = json.dumps([c["data"] for c in children], ensure_ascii=False, indent=2)
+                cid = f"l{level}-p{start_page:04d}-p{end_page:04d}-{sha256_bytes(blob.encode('utf-8'))[:8]}"
+                prompt = (
+                    f"{common_header}\n\n"
+                    f"Task: Merge these chunk_digest JSON objects (consecutive page ranges) into one chunk_digest covering pages {start_page}-{end_page}. "
+                    "Keep the most specific evidence-bearing points and cues; drop duplicates and boilerplate.\n\n"
+                    f"Digest provenance: chunk_id={cid}; pages={start_page}-{end_page}; level={level}; paper_sha256={pdf_sha256}\n"
+                    "-----BEGIN DIGESTS JSON-----\n"
+                    f"{blob}\n"
+                    "-----END DIGESTS JSON-----\n"
                 )
-                chunk_digests.append(digest["data"])
-
-            # Reduce context uses only digests (keeps token usage bounded deterministically).
-            digests_blob = json.dumps({"paper_sha256": pdf_sha256, "digests": chunk_digests}, ensure_ascii=False, indent=2)
-            context = (
-                f"Paper digests (map-pass summaries; sha256={pdf_sha256}):\n"
-                "-----BEGIN DIGESTS JSON-----\n"
-                f"{digests_blob}\n"
-                "-----END DIGESTS JSON-----\n"
+                tree_nodes[(level, index)] = {
+                    "chunk_id": cid,
+                    "pages": [start_page, end_page],
+                    "children": [n["chunk_id"] for n in below],
+                    "prompt": prompt,
+                }
+                return {"prompt": prompt, "schema_name": "chunk_digest", "schema": chunk_digest_schema}
+
+            # Map pass and merge levels share one pool; digests keep chunk order.
+            results = self._call_tree(
+                [
+                    {"prompt": prompt, "schema_name": "chunk_digest", "schema": chunk_digest_schema}
+                    for prompt in chunk_prompts.values()
+                ],
+                fan_in=fan_in,
+                levels=levels,
+                merge=merge_call,
+                config=config,
+                resolved=resolved,
             )
+            chunk_digests = [d["data"] for d in results[0]]
+            for level, row in enumerate(results[1:], start=1):
+                for i, d in enumerate(row):
+                    reduce_digests[tree_nodes[(level, i)]["chunk_id"]] = d["data"]
+
+            def digests_context(roots: List[Dict[str, Any]]) -> str:
+                # Reduce context uses only digests (keeps token usage bounded deterministically).
+                digests_blob = json.dumps({"paper_sha256": pdf_sha256, "digests": roots}, ensure_ascii=False, indent=2)
+                return (
+                    f"Paper digests (map-pass summaries; sha256={pdf_sha256}):\n"
+                    "-----BEGIN DIGESTS JSON-----\n"
+                    f"{digests_blob}\n"
+                    "-----END DIGESTS JSON-----\n"
+                )
+
+            def fits(ctx: str) -> bool:
+                if config.max_input_tokens is not None:
+                    return counter.count(ctx) <= config.max_input_tokens
+                return len(ctx) <= config.max_input_chars
+
+            # Merge further levels while the remaining digests overflow the input budget.
+            roots = [d["data"] for d in results[-1]]
+            context = digests_context(roots)
+            while len(roots) > 1 and not fits(context):
+                levels += 1
+                calls = [
+                    merge_call(levels, g, [{"data": d} for d in roots[g * fan_in : (g + 1) * fan_in]])
+                    for g in range(-(-len(roots) // fan_in))
+                ]
+                roots = [d["data"] for d in self._call_many(calls, config)]
+                for i, d in enumerate(roots):
+                    reduce_digests[tree_nodes[(levels, i)]["chunk_id"]] = d
+                context = digests_context(roots)
+
+            for level in range(levels + 1):
+                row = [tree_nodes[(lvl, i)] for (lvl, i) in sorted(tree_nodes) if lvl == level]
+                reduce_tree.append([{k: v for k, v in n.items() if k != "prompt"} for n in row])
+                if level:
+                    reduce_prompts.update({n["chunk_id"]: n["prompt"] for n in row})
 
         # 1) Metadata
         meta_prompt = (
@@ -311,7 +551,6 @@ class OpenAIEngine(ReviewEngine):
                 f"Paper lead excerpt (sha256={pdf_sha256}):\n-----BEGIN PAPER TEXT-----\n{clipped}\n-----END PAPER TEXT-----\n\n" + context
             ))
         )
-        meta = self._call(prompt=meta_prompt, schema_name="paper_review_metadata", schema=meta_schema, config=config)
 
         # 2) Scorecard
         score_prompt = (
@@ -321,7 +560,6 @@ class OpenAIEngine(ReviewEngine):
             "Include notes that justify scores with short evidence cues (no line numbers needed).\n\n"
             + context
         )
-        score = self._call(prompt=score_prompt, schema_name="paper_review_scorecard", schema=score_schema, config=config)
 
         # 3) Analysis (structured)
         analysis_prompt = (
@@ -330,7 +568,6 @@ class OpenAIEngine(ReviewEngine):
             "Guidance: be concise but concrete; emphasize assumptions, scope, methods, and claims vs evidence.\n\n"
             + context
         )
-        analysis = self._call(prompt=analysis_prompt, schema_name="paper_analysis", schema=analysis_schema, config=config)
 
         # 4) Report (structured)
         report_prompt = (
@@ -339,7 +576,18 @@ class OpenAIEngine(ReviewEngine):
             "Guidance: include executive thesis, strengths, gaps/omissions, redress/accountability notes, and recommended minimal viable upgrades.\n\n"
             + context
         )
-        report = self._call(prompt=report_prompt, schema_name="paper_review_report", schema=report_schema, config=config)
+
+        # The four artifact calls share the same context and do not depend on
+        # each other's output, so they run concurrently under the same limit.
+        meta, score, analysis, report = self._call_many(
+            [
+                {"prompt": meta_prompt, "schema_name": "paper_review_metadata", "schema": meta_schema},
+                {"prompt": score_prompt, "schema_name": "paper_review_scorecard", "schema": score_schema},
+                {"prompt": analysis_prompt, "schema_name": "paper_analysis", "schema": analysis_schema},
+                {"prompt": report_prompt, "schema_name": "paper_review_report", "schema": report_schema},
+            ],
+            config,
+        )
 
         raw = {
             "metadata": meta["raw"],
@@ -353,16 +601,25 @@ class OpenAIEngine(ReviewEngine):
                 "chunk_max_chars": config.chunk_max_chars,
                 "chunk_max_tokens": config.chunk_max_tokens,
                 "chunk_max_count": config.chunk_max_count,
+                "chunk_strategy": config.chunk_strategy,
+                "planned_chunks": planned_count,
+                "pages_total": len(pages),
+                "pages_covered": pages_covered if use_chunking else None,
                 "digests_count": len(chunk_digests),
+                "reused_chunks": reused_chunks,
+                "reduce_fan_in": config.reduce_fan_in,
+                "reduce_tree": reduce_tree,
                 "total_tokens_est": total_tokens,
             },
             "chunk_digests": chunk_digests,
+            "reduce_digests": reduce_digests,
             "prompts": {
                 "metadata": meta_prompt,
                 "scorecard": score_prompt,
                 "analysis": analysis_prompt,
                 "report": report_prompt,
                 "chunk_digests": chunk_prompts,
+                "reduce_digests": reduce_prompts,
             },
         }
 
@@ -372,6 +629,7 @@ class OpenAIEngine(ReviewEngine):
             analysis=analysis["data"],
             report=report["data"],
             raw=raw,
+            stats={**self._cache_stats(config), "token_counts": counter.stats()},
         )
 
     def semantic_validate(
@@ -395,12 +653,13 @@ class OpenAIEngine(ReviewEngine):
         schema = load_schema("schemas/reviews/semantic-validation.schema.json")
 
         # Deterministic bounded excerpt (token-aware when possible).
-        total_tokens = self._count_tokens(paper_text, config.model)
+        counter = self._token_counter(config)
+        total_tokens = counter.count(paper_text)
+        counter.save()
         if config.max_input_tokens is not None:
-            target = max(1, int(config.max_input_tokens * 4))
-            excerpt = paper_text[:target]
-            while self._count_tokens(excerpt, config.model) > config.max_input_tokens and len(excerpt) > 1000:
-                excerpt = excerpt[: int(len(excerpt) * 0.9)]
+            excerpt = paper_text
+            if total_tokens > config.max_input_tokens:
+                excerpt = clip_to_token_budget(paper_text, config.max_input_tokens, encoding=counter.encoding)
         else:
             excerpt = paper_text[: config.max_input_chars]
 
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Any, Dict
+
+from dpi_lab.core.schemas import load_schema, validate_instance
+from dpi_lab.engines.base import EngineConfig, EngineResult, ReviewEngine
+from dpi_lab.engines.openai_engine import output_text_from_dump
+
+
+ARTIFACT_SCHEMAS = {
+    "metadata": "schemas/reviews/paper-review-metadata.schema.json",
+    "scorecard": "schemas/reviews/paper-review-scorecard.schema.json",
+    "analysis": "schemas/reviews/paper-analysis.schema.json",
+    "report": "schemas/reviews/paper-review-report.schema.json",
+}
+
+
+class ReplayEngine(ReviewEngine):
+    """Rebuild structured outputs from a review's persisted raw responses.
+
+    Reads run/responses/raw.json written by a previous model-backed run and
+    re-parses the stored payloads. No network access and no tokenizer; the
+    paper text is ignored. The original raw payload is returned unchanged.
+    """
+
+    name = "replay"
+
+    def __init__(self, review_dir: Path) -> None:
+        self.review_dir = review_dir.resolve()
+
+    def load_raw(self) -> Dict[str, Any]:
+        raw_path = self.review_dir / "run" / "responses" / "raw.json"
+        if not raw_path.exists():
+            raise FileNotFoundError(f"No persisted responses at {raw_path}")
+        return json.loads(raw_path.read_text(encoding="utf-8"))
+
+    def generate(self, *, text: str, pdf_sha256: str, config: EngineConfig, pages=None, prior_digests=None) -> EngineResult:
+        raw = self.load_raw()
+        data: Dict[str, Dict[str, Any]] = {}
+        for name, schema_rel in ARTIFACT_SCHEMAS.items():
+            payload = raw.get(name)
+            if payload is None:
+                raise ValueError(f"raw.json has no stored '{name}' response; nothing to replay")
+            out = output_text_from_dump(payload)
+            if not out.strip():
+                raise ValueError(f"Stored '{name}' response has no output text")
+            obj = json.loads(out)
+            validate_instance(obj, load_schema(schema_rel), rel_path=schema_rel)
+            data[name] = obj
+
+        return EngineResult(
+            metadata=data["metadata"],
+            scorecard=data["scorecard"],
+            analysis=data["analysis"],
+            report=data["report"],
+            raw=raw,
+        )
@@ -0,0 +1 @@
+# data
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""CLI startup benchmark.
+
+Measures import time of `dpi-lab lint` (and `dpi-lab --help`) with
+`python -X importtime`, relative to a bare interpreter, and checks that
+startup stays lazy:
+- total import time added by the command must stay under --max-ms
+- none of the heavy subcommand dependencies may be imported
+
+Each command runs --runs times; the fastest run is reported.
+
+Usage:
+  tools/benchmarks/cli_startup.py [--max-ms 100] [--runs 5]
+
+Exit code is non-zero if a command exceeds the budget or imports a heavy module.
+"""
+
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+from typing import Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+
+HEAVY_MODULES = ["pypdf", "jsonschema", "yaml", "openai", "tiktoken", "numpy", "dpi_lab.engines"]
+
+
+def _importtime(code: str) -> Tuple[int, Dict[str, int]]:
+    """Return (sum of self import time in us, {module: cumulative us}) for code."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=str(REPO_ROOT),
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode not in (0, 1):
+        raise RuntimeError(f"command failed ({proc.returncode}): {proc.stderr[-2000:]}")
+    total = 0
+    modules: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = (x.strip() for x in line[len("import time:"):].split("|"))
+        total += int(self_us)
+        modules[name] = int(cumulative_us)
+    return total, modules
+
+
+def _best(code: str, runs: int) -> Tuple[int, Dict[str, int]]:
+    results = [_importtime(code) for _ in range(runs)]
+    return min(results, key=lambda r: r[0])
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark dpi-lab CLI startup imports.")
+    ap.add_argument("--max-ms", type=float, default=100.0, help="Budget for import time added by each command")
+    ap.add_argument("--runs", type=int, default=5)
+    args = ap.parse_args()
+
+    with tempfile.TemporaryDirectory() as td:
+        md = Path(td) / "sample.md"
+        md.write_text("# Sample\n\nText.\n", encoding="utf-8")
+        commands = {
+            "dpi-lab lint": ["lint", str(md)],
+            "dpi-lab --help": ["--help"],
+        }
+
+        base_us, _ = _best("pass", args.runs)
+        failures: List[str] = []
+        print(f"interpreter baseline: {base_us / 1000:.1f} ms")
+        for label, argv in commands.items():
+            code = (
+                "import sys, contextlib, io\n"
+                f"sys.argv = ['dpi-lab'] + {argv!r}\n"
+                "from dpi_lab.cli.main import main\n"
+                "with contextlib.redirect_stdout(io.StringIO()):\n"
+                "    try:\n"
+                "        main()\n"
+                "    except SystemExit:\n"
+                "        pass\n"
+            )
+            total_us, modules = _best(code, args.runs)
+            added_ms = (total_us - base_us) / 1000
+            heavy = sorted(m for m in modules if any(m == h or m.startswith(h + ".") for h in HEAVY_MODULES))
+            print(f"{label:<16} +{added_ms:6.1f} ms  ({len(modules)} modules)")
+            if added_ms > args.max_ms:
+                failures.append(f"{label}: +{added_ms:.1f} ms exceeds budget of {args.max_ms:.1f} ms")
+            if heavy:
+                failures.append(f"{label}: imports heavy modules: {', '.join(heavy[:8])}")
+
+    if failures:
+        print("FAILED")
+        for f in failures:
+            print(f"- {f}")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,111 @@
+#!/usr/bin/env python3
+"""Extraction regression harness.
+
+Compares the current canonicalization with the legacy two-pass algorithm on
+the same raw page text:
+- single-pass: dpi_lab.core.extract.canonicalize_pages (in memory)
+- streaming:   dpi_lab.core.extract.write_canonical_outputs (what extract_pdf uses)
+
+Output hashes for paper.text.v1.txt and paper.pages.v1.json MUST match the
+legacy algorithm; peak Python memory (tracemalloc) of each is reported.
+
+PDF parsing runs once up front and is excluded from the measurement.
+
+Usage:
+  tools/benchmarks/extract_regression.py <paper.pdf> [<paper.pdf> ...]
+
+Exit code is non-zero if any output hash differs.
+"""
+
+from __future__ import annotations
+
+import json
+import sys
+import tempfile
+import time
+import tracemalloc
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from pypdf import PdfReader  # noqa: E402
+
+from dpi_lab.core.extract import (  # noqa: E402
+    PAGE_MARKER_FMT,
+    canonicalize_pages,
+    canonicalize_text,
+    iter_raw_pages,
+    write_canonical_outputs,
+)
+from dpi_lab.core.utils import sha256_bytes  # noqa: E402
+
+
+def legacy_canonicalize(raw_pages: List[str]) -> Tuple[str, List[Dict[str, Any]]]:
+    # Reference copy of the pre-single-pass algorithm: marker-prefixed pages,
+    # whole-document canonicalization, then per-page recovery by split.
+    pages_text = [PAGE_MARKER_FMT.format(n=i) + t for i, t in enumerate(raw_pages, start=1)]
+    canon = canonicalize_text("".join(pages_text))
+    pages = []
+    for i in range(1, len(raw_pages) + 1):
+        page_txt = pages_text[i - 1].split(PAGE_MARKER_FMT.format(n=i), 1)[-1]
+        pages.append({"page": i, "text": canonicalize_text(page_txt)})
+    return canon, pages
+
+
+def _hashes(canon: str, pages: List[Dict[str, Any]]) -> Tuple[str, str]:
+    pages_json = json.dumps({"version": 1, "pages": pages}, ensure_ascii=False, indent=2) + "\n"
+    return sha256_bytes(canon.encode("utf-8")), sha256_bytes(pages_json.encode("utf-8"))
+
+
+def _measure(fn: Callable[[List[str]], Tuple[str, str]], raw_pages: List[str]):
+    tracemalloc.start()
+    t0 = time.perf_counter()
+    hashes = fn(raw_pages)
+    elapsed = time.perf_counter() - t0
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return hashes, peak, elapsed
+
+
+def _streaming_hashes(raw_pages: List[str]) -> Tuple[str, str]:
+    with tempfile.TemporaryDirectory() as tmp:
+        _, text_hash, pages_hash = write_canonical_outputs(iter(raw_pages), Path(tmp))
+    return text_hash, pages_hash
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = argv or sys.argv[1:]
+    if not argv:
+        print("usage: extract_regression.py <paper.pdf> [<paper.pdf> ...]")
+        return 2
+
+    failed = False
+    for arg in argv:
+        pdf = Path(arg).expanduser().resolve()
+        raw_pages = list(iter_raw_pages(PdfReader(str(pdf)), pdf))
+        raw_mb = sum(len(t) for t in raw_pages) / 1e6
+
+        runs = [
+            ("legacy", lambda r: _hashes(*legacy_canonicalize(r))),
+            ("single-pass", lambda r: _hashes(*canonicalize_pages(iter(r)))),
+            ("streaming", _streaming_hashes),
+        ]
+        print(f"{pdf.name}: {len(raw_pages)} pages, {raw_mb:.1f}M chars")
+        ref = None
+        for label, fn in runs:
+            h, peak, elapsed = _measure(fn, raw_pages)
+            ref = ref or h
+            same = h == ref
+            failed = failed or not same
+            status = "identical" if same else "DIFFERENT"
+            print(f"  {label:<12} peak {peak / 1e6:8.1f} MB  {elapsed:6.2f}s  {status} (text={h[0][:12]} pages={h[1][:12]})")
+
+    print("FAILED" if failed else "OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
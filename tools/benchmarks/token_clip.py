@@ -0,0 +1,122 @@
+#!/usr/bin/env python3
+"""Token clipping benchmark.
+
+Compares dpi_lab.core.tokens.clip_to_token_budget with the legacy shrink loop
+(clip to max_tokens*4 chars, then cut 10% and re-encode until within budget)
+that engines used before:
+- number of encode() calls and wall time per budget
+- retained characters (the new clip keeps the longest prefix in budget)
+
+Both results MUST be prefixes of the input within the token budget.
+
+Requires tiktoken and its encoding files (downloaded on first use).
+
+Usage:
+  tools/benchmarks/token_clip.py <paper.text.v1.txt> [--encoding o200k_base] [--budgets 1000,8000,32000]
+
+Exit code is non-zero if a clipped text exceeds its budget or is not a prefix.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+from dpi_lab.core.tokens import clip_to_token_budget  # noqa: E402
+
+
+def legacy_clip(text: str, max_tokens: int, count: Callable[[str], int]) -> str:
+    # Reference copy of the pre-utility loop from OpenAIEngine.generate.
+    clipped = text[: max(1, int(max_tokens * 4))]
+    while count(clipped) > max_tokens and len(clipped) > 1000:
+        clipped = clipped[: int(len(clipped) * 0.9)]
+    return clipped
+
+
+class _CountingEncoding:
+    def __init__(self, enc: Any) -> None:
+        self.enc = enc
+        self.calls = 0
+
+    def encode(self, text: str) -> List[int]:
+        self.calls += 1
+        return self.enc.encode(text)
+
+    def decode_bytes(self, ids: List[int]) -> bytes:
+        return self.enc.decode_bytes(ids)
+
+
+def _measure(fn: Callable[[], str]) -> Tuple[str, float]:
+    t0 = time.perf_counter()
+    out = fn()
+    return out, time.perf_counter() - t0
+
+
+def run(text: str, budgets: List[int], enc: Any) -> Tuple[List[Dict[str, Any]], List[str]]:
+    rows: List[Dict[str, Any]] = []
+    errors: List[str] = []
+    for budget in budgets:
+        row: Dict[str, Any] = {"budget": budget}
+        for label in ("legacy", "clip"):
+            counting = _CountingEncoding(enc)
+            if label == "legacy":
+                out, secs = _measure(lambda: legacy_clip(text, budget, lambda s: len(counting.encode(s))))
+            else:
+                out, secs = _measure(lambda: clip_to_token_budget(text, budget, encoding=counting))
+            tokens = len(enc.encode(out))
+            row[label] = {"encodes": counting.calls, "seconds": secs, "chars": len(out), "tokens": tokens}
+            if not text.startswith(out):
+                errors.append(f"{label} budget={budget}: result is not a prefix of the input")
+            # The legacy loop stops shrinking at 1000 chars; only the new clip is strict.
+            if label == "clip" and tokens > budget:
+                errors.append(f"{label} budget={budget}: {tokens} tokens exceeds budget")
+        rows.append(row)
+    return rows, errors
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark token-budget clipping.")
+    ap.add_argument("text", help="Canonical text file (e.g. extracted/paper.text.v1.txt)")
+    ap.add_argument("--encoding", default="o200k_base", help="tiktoken encoding name")
+    ap.add_argument("--budgets", default="1000,8000,32000", help="Comma-separated token budgets")
+    args = ap.parse_args()
+
+    try:
+        import tiktoken  # type: ignore
+
+        enc = tiktoken.get_encoding(args.encoding)
+    except Exception as e:
+        print(f"ERROR: cannot load tiktoken encoding {args.encoding!r}: {e}", file=sys.stderr)
+        return 2
+
+    text = Path(args.text).read_text(encoding="utf-8")
+    budgets = [int(b) for b in args.budgets.split(",") if b.strip()]
+    rows, errors = run(text, budgets, enc)
+
+    print(f"input: {len(text)} chars, {len(enc.encode(text))} tokens ({args.encoding})")
+    print(f"{'budget':>8}  {'legacy enc':>10} {'legacy s':>9} {'legacy chars':>12}  {'clip enc':>8} {'clip s':>8} {'clip chars':>10}")
+    for r in rows:
+        lg, cl = r["legacy"], r["clip"]
+        print(
+            f"{r['budget']:>8}  {lg['encodes']:>10} {lg['seconds']:>9.4f} {lg['chars']:>12}"
+            f"  {cl['encodes']:>8} {cl['seconds']:>8.4f} {cl['chars']:>10}"
+        )
+
+    if errors:
+        print("FAILED")
+        for e in errors:
+            print(f"- {e}")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
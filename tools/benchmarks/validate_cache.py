@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""Schema/validator cache micro-benchmark.
+
+Times the schema checks of `dpi-lab validate` over every review directory
+under a root, and the per-response check in OpenAIEngine._call:
+- legacy: re-read the schema and build a validator for every instance
+          (jsonschema.validate for the engine path, which also re-checks the schema)
+- cached: dpi_lab.core.schemas.load_validator / validate_instance
+
+Usage:
+  tools/benchmarks/validate_cache.py [<reviews_root>] [--repeat 20]
+
+Exit code is non-zero if the cached and legacy paths report different errors.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Tuple
+
+REPO_ROOT = Path(__file__).resolve().parents[2]
+if str(REPO_ROOT) not in sys.path:
+    sys.path.insert(0, str(REPO_ROOT))
+
+import yaml  # noqa: E402
+from jsonschema import Draft202012Validator, ValidationError  # noqa: E402
+from jsonschema import validate as js_validate  # noqa: E402
+
+from dpi_lab.core.schemas import _read_schema, load_validator, validate_instance, load_schema  # noqa: E402
+from dpi_lab.core.validate import validate_tree  # noqa: E402
+
+SCHEMAS = {
+    "paper-review-metadata.yaml": "schemas/reviews/paper-review-metadata.schema.json",
+    "paper-review-scorecard.yaml": "schemas/reviews/paper-review-scorecard.schema.json",
+}
+
+
+def _errors(v: Any, instance: Any) -> List[str]:
+    return sorted(f"{list(e.path)}: {e.message}" for e in v.iter_errors(instance))
+
+
+def legacy_check(instances: List[Tuple[str, Any]]) -> List[List[str]]:
+    return [_errors(Draft202012Validator(_read_schema(rel)), inst) for rel, inst in instances]
+
+
+def cached_check(instances: List[Tuple[str, Any]]) -> List[List[str]]:
+    return [_errors(load_validator(rel, cls=Draft202012Validator), inst) for rel, inst in instances]
+
+
+def legacy_call(instances: List[Tuple[str, Any]]) -> List[str]:
+    out = []
+    for rel, inst in instances:
+        try:
+            js_validate(instance=inst, schema=load_schema(rel))
+            out.append("")
+        except ValidationError as e:
+            out.append(e.message)
+    return out
+
+
+def cached_call(instances: List[Tuple[str, Any]]) -> List[str]:
+    out = []
+    for rel, inst in instances:
+        try:
+            validate_instance(inst, load_schema(rel), rel_path=rel)
+            out.append("")
+        except ValidationError as e:
+            out.append(e.message)
+    return out
+
+
+def _time(fn: Callable[[], Any], repeat: int) -> Tuple[Any, float]:
+    t0 = time.perf_counter()
+    for _ in range(repeat):
+        out = fn()
+    return out, (time.perf_counter() - t0) / repeat
+
+
+def main() -> int:
+    ap = argparse.ArgumentParser(description="Benchmark schema/validator caching.")
+    ap.add_argument("root", nargs="?", default=str(REPO_ROOT / "reviews"), help="Tree containing review directories")
+    ap.add_argument("--repeat", type=int, default=20)
+    args = ap.parse_args()
+
+    root = Path(args.root)
+    instances: List[Tuple[str, Any]] = []
+    for name, rel in SCHEMAS.items():
+        for p in sorted(root.rglob(name)):
+            instances.append((rel, yaml.safe_load(p.read_text(encoding="utf-8"))))
+    if not instances:
+        print(f"ERROR: no review artifacts under {root}", file=sys.stderr)
+        return 2
+
+    failures: List[str] = []
+    rows = []
+    for label, legacy, cached in (
+        ("validate (Draft202012Validator)", legacy_check, cached_check),
+        ("engine (jsonschema.validate)", legacy_call, cached_call),
+    ):
+        a, t_legacy = _time(lambda: legacy(instances), args.repeat)
+        b, t_cached = _time(lambda: cached(instances), args.repeat)
+        rows.append((label, t_legacy, t_cached))
+        if a != b:
+            failures.append(f"{label}: cached results differ from legacy")
+
+    _, t_tree = _time(lambda: validate_tree(root, level="schema"), max(1, args.repeat // 4))
+
+    print(f"instances: {len(instances)} under {root} (repeat={args.repeat})")
+    for label, t_legacy, t_cached in rows:
+        speedup = t_legacy / t_cached if t_cached else float("inf")
+        print(f"{label:<34} legacy {t_legacy * 1000:8.2f} ms  cached {t_cached * 1000:8.2f} ms  x{speedup:.1f}")
+    print(f"{'validate_tree(level=schema)':<34} {t_tree * 1000:8.2f} ms per run")
+
+    if failures:
+        print("FAILED")
+        for f in failures:
+            print(f"- {f}")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())